@@ -0,0 +1,230 @@
+import argparse
+import contextlib
+import inspect
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tracemalloc
+from datetime import datetime
+from time import perf_counter
+
+from common import memo, parse_cache
+from common.puzzle import set_provider
+from generators import generate
+from run_all import load_day, parse_days
+
+PART_NAME = re.compile(r"^part[12](_\w+)?$")
+
+# variants which don't finish in reasonable time on the real input, run them with --all
+SLOW_VARIANTS = {'day05.part2_reverse_search', 'day08.part2', 'day21.part2_naive', 'day25.part1_slow',
+                 'day25.part1_faster_but_still_slow'}
+
+
+def discover(day):
+    """Returns {name: function} of every partN and partN_variant which can be called with input only."""
+    module = load_day(day)
+    solvers = {}
+    for name, func in inspect.getmembers(module, inspect.isfunction):
+        if func.__module__ != module.__name__ or not PART_NAME.match(name):
+            continue
+        required = [p for p in list(inspect.signature(func).parameters.values())[1:] if p.default is p.empty]
+        if required:
+            print(f"skipping day{day:02}.{name}, it needs {', '.join(p.name for p in required)}")
+            continue
+        solvers[f"day{day:02}.{name}"] = func
+    return solvers
+
+
+def clear_caches(func):
+    """Clears functools caches of the solver's module so every run does the full work."""
+    for member in vars(inspect.getmodule(func)).values():
+        # not callable members are skipped, hasattr would make a LazyPuzzle fetch its puzzle
+        if callable(member) and hasattr(member, 'cache_clear'):
+            member.cache_clear()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(runs):
+    return {
+        'median': statistics.median(runs),
+        'p95': percentile(runs, 0.95),
+        'stddev': statistics.stdev(runs) if len(runs) > 1 else 0.0,
+        'min': min(runs),
+        'mean': statistics.mean(runs),
+        'runs': runs,
+    }
+
+
+def time_solver(func, input_data, warmup, repeat):
+    runs = []
+    with contextlib.redirect_stdout(io.StringIO()):  # solvers print progress
+        for i in range(warmup + repeat):
+            clear_caches(func)
+            start = perf_counter()
+            func(input_data)
+            if i >= warmup:
+                runs.append(perf_counter() - start)
+    return runs
+
+
+def measure_peak_memory(func, input_data, **kwargs):
+    """Runs the solver once more under tracemalloc, it's too slow to do that in timed runs."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        clear_caches(func)
+        tracemalloc.start()
+        try:
+            func(input_data, **kwargs)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+
+def measure_generated(day, func, size, seed=0, repeat=1, arguments=None, memory=False):
+    """
+    Fastest of repeat runs of func on the day's generated input of the given size, with the answer and,
+    when memory is on, the traced peak. arguments(input_data) gives keyword arguments which depend on
+    the input, like day 21's steps.
+    """
+    input_data = generate(day, size, seed)
+    kwargs = arguments(input_data) if arguments else {}
+    runs = []
+    # solvers print progress and tqdm bars
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        for _ in range(repeat):
+            clear_caches(func)
+            start = perf_counter()
+            answer = func(input_data, **kwargs)
+            runs.append(perf_counter() - start)
+    return {
+        'size': size,
+        'n': len(input_data),
+        'time': min(runs),
+        'answer': answer,
+        'peak_memory': measure_peak_memory(func, input_data, **kwargs) if memory else None,
+    }
+
+
+def benchmark(days, pattern=None, warmup=1, repeat=5, example=False, include_slow=False, memory=True):
+    results = {}
+    for day in days:
+        puzzle = load_day(day).puzzle
+        for name, func in discover(day).items():
+            if pattern is not None and not re.search(pattern, name):
+                continue
+            if name in SLOW_VARIANTS and not include_slow:
+                continue
+            input_data = puzzle.examples[0].input_data if example else puzzle.input_data
+            try:
+                runs = time_solver(func, input_data, warmup, repeat)
+            except Exception as e:  # one broken solver shouldn't stop the whole suite
+                print(f"{name:<40} failed: {e!r}")
+                continue
+            results[name] = summarize(runs)
+            if memory:
+                results[name]['peak_memory'] = measure_peak_memory(func, input_data)
+            print_result(name, results[name])
+    return results
+
+
+def print_result(name, result):
+    memory = f"  peak {result['peak_memory'] / 1024:>10.1f} KiB" if 'peak_memory' in result else ''
+    print(f"{name:<40} median {result['median'] * 1000:>10.2f} ms  p95 {result['p95'] * 1000:>10.2f} ms  "
+          f"stddev {result['stddev'] * 1000:>8.2f} ms{memory}")
+
+
+def compare(baseline, results, threshold, memory_threshold, min_time):
+    """
+    Returns names of solvers whose median time or peak memory grew by more than the threshold.
+    Differences below min_time seconds are ignored, as they are mostly noise.
+    """
+    regressions = []
+    print(f"{'solver':<40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<40} {'-':>12} {result['median'] * 1000:>9.2f} ms     new")
+            continue
+        old = baseline[name]
+        change = result['median'] / old['median'] - 1
+        regressed = change > threshold and result['median'] - old['median'] > min_time
+        print(f"{name:<40} {old['median'] * 1000:>9.2f} ms {result['median'] * 1000:>9.2f} ms "
+              f"{change:>+8.0%}{'  REGRESSION' if regressed else ''}")
+        if 'peak_memory' in result and old.get('peak_memory'):
+            memory_change = result['peak_memory'] / old['peak_memory'] - 1
+            if memory_change > memory_threshold:
+                print(f"{'':<40} {old['peak_memory'] / 1024:>8.1f} KiB {result['peak_memory'] / 1024:>8.1f} KiB "
+                      f"{memory_change:>+8.0%}  MEMORY REGRESSION")
+                regressed = True
+        if regressed:
+            regressions.append(name)
+    for name in baseline.keys() - results.keys():
+        print(f"{name:<40} missing from this run")
+    return regressions
+
+
+def save_baseline(path, results, warmup, repeat, example):
+    baseline = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'warmup': warmup,
+            'repeat': repeat,
+            'input': 'example' if example else 'input',
+        },
+        'results': results,
+    }
+    with open(path, 'w') as file:
+        json.dump(baseline, file, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every partN and its variants")
+    parser.add_argument('--days', type=parse_days, default=list(range(1, 26)), help="e.g. 1-5,11")
+    parser.add_argument('--only', help="regex on names like day14.part2")
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--example', action='store_true', help="use the first example instead of the input")
+    parser.add_argument('--all', action='store_true', help="include variants known to be very slow")
+    parser.add_argument('--offline', action='store_true', help="read puzzles from the local store")
+    parser.add_argument('--output', default='benchmark.json', help="where to store the results")
+    parser.add_argument('--no-memory', action='store_true', help="don't measure peak memory")
+    parser.add_argument('--parse-cache', action='store_true', help="load parsed inputs from .cache/parsed")
+    parser.add_argument('--memo-cache', action='store_true', help="keep memoized solver results in .cache/memo")
+    parser.add_argument('--compare', metavar='BASELINE', help="fail if results regressed against this baseline")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed relative growth of median time")
+    parser.add_argument('--memory-threshold', type=float, default=0.2, help="allowed relative growth of peak memory")
+    parser.add_argument('--min-time', type=float, default=0.001, help="ignore time differences below it [s]")
+    args = parser.parse_args()
+    if args.offline:
+        set_provider('local')
+    if args.parse_cache:
+        parse_cache.enable()
+    if args.memo_cache:
+        memo.enable()
+    baseline = None
+    if args.compare:  # read before anything is written, --output may be the same file
+        with open(args.compare) as file:
+            baseline = json.load(file)['results']
+    results = benchmark(args.days, args.only, args.warmup, args.repeat, args.example, args.all,
+                        memory=not args.no_memory)
+    if args.compare and os.path.realpath(args.output) == os.path.realpath(args.compare):
+        print(f"not overwriting the baseline {args.compare}, pass another --output to keep these results")
+    else:
+        save_baseline(args.output, results, args.warmup, args.repeat, args.example)
+    if baseline is not None:
+        regressions = compare(baseline, results, args.threshold, args.memory_threshold, args.min_time)
+        if regressions:
+            print(f"{len(regressions)} regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
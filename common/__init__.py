@@ -0,0 +1,13 @@
+import os
+
+
+def share_setting(name, value):
+    """
+    Stores a setting in the environment, where worker processes started later inherit it, or removes
+    it when value is None. Returns the value.
+    """
+    if value is None:
+        os.environ.pop(name, None)
+    else:
+        os.environ[name] = value
+    return value
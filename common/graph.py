@@ -0,0 +1,264 @@
+from array import array
+from heapq import heappush, heappop
+
+
+class Labels:
+    """Interns hashable labels, like day 8's 'AAA' or grid indices, to dense ids 0, 1, 2, ..."""
+    __slots__ = ('ids', 'names')
+
+    def __init__(self, names=()):
+        self.ids = {}
+        self.names = []
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name):
+        node = self.ids.get(name)
+        if node is None:
+            node = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return node
+
+    def get(self, name, default=-1):
+        return self.ids.get(name, default)
+
+    def __getitem__(self, name):
+        return self.ids[name]
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def __len__(self):
+        return len(self.names)
+
+
+class Graph:
+    """
+    Directed graph in compressed sparse row form. Edges of node n are the positions
+    offsets[n]:offsets[n + 1] of targets and weights, so walking a node's edges is a range
+    over two arrays instead of dict lookups and tuple hashing. Undirected graphs store
+    both directions.
+    """
+    __slots__ = ('labels', 'offsets', 'targets', 'weights')
+
+    def __init__(self, labels, offsets, targets, weights):
+        self.labels = labels
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_lists(cls, labels, sources, targets, weights=None):
+        """Edges given as parallel lists of ids, their order per source is kept. Weights default to 1."""
+        weights = [1] * len(targets) if weights is None else weights
+        typecode = 'q' if all(type(weight) is int for weight in weights) else 'd'
+        size = len(labels)
+        offsets = array('q', bytes(8 * (size + 1)))
+        for source in sources:
+            offsets[source + 1] += 1
+        for node in range(size):
+            offsets[node + 1] += offsets[node]
+        position = offsets[:-1]
+        sorted_targets = array('q', bytes(8 * len(targets)))
+        sorted_weights = array(typecode, bytes(8 * len(targets)))
+        for edge, source in enumerate(sources):
+            sorted_targets[position[source]] = targets[edge]
+            sorted_weights[position[source]] = weights[edge]
+            position[source] += 1
+        return cls(labels, offsets, sorted_targets, sorted_weights)
+
+    @classmethod
+    def from_edges(cls, edges, labels=None, undirected=False):
+        """Edges are (source, target) or (source, target, weight) tuples of labels."""
+        labels = Labels() if labels is None else labels
+        sources, targets, weights = [], [], []
+        for edge in edges:
+            source, target = labels.intern(edge[0]), labels.intern(edge[1])
+            weight = edge[2] if len(edge) > 2 else 1
+            sources.append(source)
+            targets.append(target)
+            weights.append(weight)
+            if undirected:
+                sources.append(target)
+                targets.append(source)
+                weights.append(weight)
+        return cls.from_lists(labels, sources, targets, weights)
+
+    @classmethod
+    def from_adjacency(cls, adjacency, weighted=False):
+        """
+        From {label: [label, ...]}, or {label: [(label, weight), ...]} when weighted. Keys get
+        ids in their order, then labels seen only as targets. Edges keep their order.
+        """
+        labels = Labels(adjacency)
+        ids, intern = labels.ids, labels.intern
+        offsets, targets, weights = [0], [], []
+        for edges in adjacency.values():
+            if weighted:
+                for target, weight in edges:
+                    targets.append(ids[target] if target in ids else intern(target))
+                    weights.append(weight)
+            else:
+                targets += [ids[target] if target in ids else intern(target) for target in edges]
+            offsets.append(len(targets))
+        offsets += [len(targets)] * (len(labels) + 1 - len(offsets))  # labels seen only as targets
+        if not weighted:
+            return cls(labels, array('q', offsets), array('q', targets), array('q', [1]) * len(targets))
+        typecode = 'q' if all(type(weight) is int for weight in weights) else 'd'
+        return cls(labels, array('q', offsets), array('q', targets), array(typecode, weights))
+
+    @classmethod
+    def from_grid(cls, grid, passable):
+        """Cells of a common.grid.Grid are nodes with ids equal to their index, linked to passable neighbours."""
+        cells = grid.cells
+        sources, targets = [], []
+        for position in grid.indices():
+            if not passable(cells[position]):
+                continue
+            for offset in grid.neighbours4:
+                if passable(cells[position + offset]):
+                    sources.append(position)
+                    targets.append(position + offset)
+        return cls.from_lists(range(len(cells)), sources, targets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def edge_range(self, node):
+        return range(self.offsets[node], self.offsets[node + 1])
+
+    def neighbours(self, node):
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def degree(self, node):
+        return self.offsets[node + 1] - self.offsets[node]
+
+    def edges(self):
+        """(source, target, weight) labels of every edge."""
+        names = self.labels.names if isinstance(self.labels, Labels) else self.labels
+        for node in range(len(self)):
+            for edge in self.edge_range(node):
+                yield names[node], names[self.targets[edge]], self.weights[edge]
+
+
+class BucketQueue:
+    """
+    Priority queue for non-negative integer priorities which never go below the last popped one,
+    like Dijkstra costs with integer weights. A list of buckets per priority makes push and pop
+    constant time instead of heapq's log n.
+    """
+    __slots__ = ('buckets', 'current', 'size')
+
+    def __init__(self):
+        self.buckets = [[]]
+        self.current = 0
+        self.size = 0
+
+    def push(self, priority, item):
+        buckets = self.buckets
+        while len(buckets) <= priority:
+            buckets.append([])
+        buckets[priority].append(item)
+        self.size += 1
+
+    def pop(self):
+        """Returns (priority, item) of an item with the lowest priority."""
+        if self.size == 0:
+            raise IndexError("pop from an empty bucket queue")
+        buckets = self.buckets
+        while not buckets[self.current]:
+            self.current += 1
+        self.size -= 1
+        return self.current, buckets[self.current].pop()
+
+    def __len__(self):
+        return self.size
+
+
+def bfs(graph, start):
+    """Number of edges on the shortest path from start to every node, -1 where there is none."""
+    offsets, targets = graph.offsets, graph.targets
+    distances = [-1] * len(graph)
+    distances[start] = 0
+    order = [start]
+    for node in order:
+        distance = distances[node] + 1
+        for edge in range(offsets[node], offsets[node + 1]):
+            target = targets[edge]
+            if distances[target] == -1:
+                distances[target] = distance
+                order.append(target)
+    return distances
+
+
+def dfs(graph, start):
+    """Nodes reachable from start in depth first preorder, edges taken in their stored order."""
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(len(graph))
+    order = []
+    stack = [start]
+    while stack:
+        node = stack.pop()
+        if visited[node]:
+            continue
+        visited[node] = 1
+        order.append(node)
+        for edge in reversed(range(offsets[node], offsets[node + 1])):
+            if not visited[targets[edge]]:
+                stack.append(targets[edge])
+    return order
+
+
+def dijkstra(graph, start, target=None):
+    """
+    Lowest total weight from start to every node, -1 where there is none. Stops once target is
+    settled. Integer weights use a BucketQueue, others a heap.
+    """
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    distances = [-1] * len(graph)
+    if weights.typecode == 'q':
+        queue = BucketQueue()
+        push, pop = queue.push, queue.pop
+    else:
+        queue = []
+
+        def push(priority, item):
+            heappush(queue, (priority, item))
+
+        def pop():
+            return heappop(queue)
+    push(0, start)
+    while queue:
+        distance, node = pop()
+        if distances[node] != -1:
+            continue
+        distances[node] = distance
+        if node == target:
+            break
+        for edge in range(offsets[node], offsets[node + 1]):
+            if distances[targets[edge]] == -1:
+                push(distance + weights[edge], targets[edge])
+    return distances
+
+
+def components(graph):
+    """
+    Component id of every node and the number of components, treating edges as undirected
+    only if the graph stores both directions.
+    """
+    offsets, targets = graph.offsets, graph.targets
+    component = [-1] * len(graph)
+    count = 0
+    for root in range(len(graph)):
+        if component[root] != -1:
+            continue
+        component[root] = count
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for edge in range(offsets[node], offsets[node + 1]):
+                if component[targets[edge]] == -1:
+                    component[targets[edge]] = count
+                    stack.append(targets[edge])
+        count += 1
+    return component, count
@@ -0,0 +1,109 @@
+class Grid:
+    """
+    Cells of a width x height grid stored row by row in one flat bytearray, surrounded by a one cell
+    border of sentinel bytes. A cell is addressed by a single index and its neighbours by adding
+    offsets, the border stops walks at the edge, so inner loops need no bounds checks:
+
+        index(y, x) = (y + 1) * stride + x + 1,  stride = width + 2
+    """
+    __slots__ = ('width', 'height', 'stride', 'border', 'cells')
+
+    def __init__(self, width, height, cells=None, border=0, fill=0):
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+        self.border = as_byte(border)
+        if cells is None:
+            cells = bytearray([self.border]) * (self.stride * (height + 2))
+            for y in range(height):
+                start = self.index(y, 0)
+                cells[start:start + width] = bytes([as_byte(fill)]) * width
+        self.cells = cells
+
+    @classmethod
+    def from_rows(cls, rows, border=0):
+        """Rows are str or bytes-like of equal length."""
+        border = as_byte(border)
+        width = len(rows[0])
+        edge = bytes([border]) * (width + 2)
+        side = bytes([border])
+        cells = bytearray(edge)
+        for row in rows:
+            cells += side + (row.encode() if isinstance(row, str) else bytes(row)) + side
+        cells += edge
+        return cls(width, len(rows), cells, border)
+
+    @classmethod
+    def from_text(cls, text, border=0):
+        return cls.from_rows(text.split("\n"), border)
+
+    def index(self, y, x):
+        return (y + 1) * self.stride + x + 1
+
+    def position(self, index):
+        y, x = divmod(index, self.stride)
+        return y - 1, x - 1
+
+    def __getitem__(self, position):
+        y, x = position
+        return self.cells[(y + 1) * self.stride + x + 1]
+
+    def __setitem__(self, position, value):
+        y, x = position
+        self.cells[(y + 1) * self.stride + x + 1] = as_byte(value)
+
+    def find(self, value):
+        """Index of the first cell holding value, -1 if there is none."""
+        return self.cells.find(as_byte(value), self.stride)
+
+    def indices(self):
+        """Indices of inner cells, row by row."""
+        for y in range(self.height):
+            start = self.index(y, 0)
+            yield from range(start, start + self.width)
+
+    @property
+    def neighbours4(self):
+        """Offsets to the cell above, on the right, below and on the left."""
+        return -self.stride, 1, self.stride, -1
+
+    @property
+    def neighbours8(self):
+        s = self.stride
+        return -s, -s + 1, 1, s + 1, s, s - 1, -1, -s - 1
+
+    def row(self, y):
+        """Zero-copy view of row y."""
+        start = self.index(y, 0)
+        return memoryview(self.cells)[start:start + self.width]
+
+    def column(self, x):
+        """Zero-copy strided view of column x."""
+        return memoryview(self.cells)[self.index(0, x):self.index(self.height - 1, x) + 1:self.stride]
+
+    def rows(self):
+        """Copies of the rows, faster to compare and hash than views."""
+        cells, width = self.cells, self.width
+        return [bytes(cells[start:start + width]) for start in range(self.stride + 1, self.index(self.height, 0), self.stride)]
+
+    def copy(self):
+        return Grid(self.width, self.height, bytearray(self.cells), self.border)
+
+    def transposed(self):
+        cells, stride = self.cells, self.stride
+        end = self.index(self.height, 0)
+        return Grid.from_rows([cells[start:end:stride] for start in range(self.index(0, 0), self.index(0, self.width))],
+                              self.border)
+
+    def __eq__(self, other):
+        return isinstance(other, Grid) and self.width == other.width and self.cells == other.cells
+
+    def __hash__(self):
+        return hash((self.width, bytes(self.cells)))
+
+    def __str__(self):
+        return "\n".join(row.decode() for row in self.rows())
+
+
+def as_byte(value):
+    return ord(value) if isinstance(value, str) else value
@@ -0,0 +1,126 @@
+from math import prod
+
+
+class Interval:
+    """
+    Half-open integer interval [start, end), empty when end <= start. Exact for any size of
+    int, so there are no float infinities or nan standing in for unbounded or empty ranges.
+    """
+    __slots__ = ('start', 'end')
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def closed(cls, first, last):
+        """Interval of first..last, both included, like puzzle ranges usually are."""
+        return cls(first, last + 1)
+
+    @property
+    def last(self):
+        return self.end - 1
+
+    def __len__(self):
+        return max(0, self.end - self.start)
+
+    def __bool__(self):
+        return self.end > self.start
+
+    def __contains__(self, value):
+        return self.start <= value < self.end
+
+    def overlaps(self, other):
+        return self.start < other.end and other.start < self.end and self.start < self.end and other.start < other.end
+
+    def intersection(self, other):
+        return Interval(max(self.start, other.start), min(self.end, other.end))
+
+    __and__ = intersection
+
+    def difference(self, other):
+        """Non-empty parts of self outside other, at most one on each side."""
+        parts = []
+        if other.start > self.start:
+            below = Interval(self.start, min(self.end, other.start))
+            if below:
+                parts.append(below)
+        if other.end < self.end:
+            above = Interval(max(self.start, other.end), self.end)
+            if above:
+                parts.append(above)
+        return parts
+
+    def split(self, value):
+        """Parts below value and from value on, either can be empty."""
+        return Interval(self.start, min(self.end, value)), Interval(max(self.start, value), self.end)
+
+    def shifted(self, offset):
+        return Interval(self.start + offset, self.end + offset)
+
+    def __eq__(self, other):
+        return isinstance(other, Interval) and self.start == other.start and self.end == other.end
+
+    def __hash__(self):
+        return hash((self.start, self.end))
+
+    def __repr__(self):
+        return f'Interval({self.start}, {self.end})'
+
+
+class Box:
+    """N-dimensional box as a tuple of Intervals, one per axis, empty when any side is."""
+    __slots__ = ('sides',)
+
+    def __init__(self, *sides):
+        self.sides = sides
+
+    @property
+    def volume(self):
+        return prod(len(side) for side in self.sides)
+
+    def __bool__(self):
+        return all(self.sides)
+
+    def overlaps(self, other):
+        for side, other_side in zip(self.sides, other.sides):
+            if not side.overlaps(other_side):
+                return False
+        return True
+
+    def intersection(self, other):
+        return Box(*(side & other_side for side, other_side in zip(self.sides, other.sides)))
+
+    __and__ = intersection
+
+    def difference(self, other):
+        """Disjoint non-empty boxes covering the part of self outside other."""
+        if not self.overlaps(other):
+            return [self] if self else []
+        pieces = []
+        rest = list(self.sides)
+        for axis, cut in enumerate(other.sides):
+            for part in rest[axis].difference(cut):
+                pieces.append(Box(*rest[:axis], part, *rest[axis + 1:]))
+            rest[axis] = rest[axis] & cut
+        return pieces
+
+    def split(self, axis, value):
+        """Parts of the box below value and from value on along the axis."""
+        below, above = self.sides[axis].split(value)
+        return self.replace(axis, below), self.replace(axis, above)
+
+    def replace(self, axis, side):
+        return Box(*self.sides[:axis], side, *self.sides[axis + 1:])
+
+    def shifted(self, axis, offset):
+        return self.replace(axis, self.sides[axis].shifted(offset))
+
+    def __eq__(self, other):
+        return isinstance(other, Box) and self.sides == other.sides
+
+    def __hash__(self):
+        return hash(self.sides)
+
+    def __repr__(self):
+        return f"Box({', '.join(map(repr, self.sides))})"
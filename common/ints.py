@@ -0,0 +1,42 @@
+import re
+from array import array
+
+# every byte but digits, minus and newline becomes a space
+NOT_NUMBER = bytes.maketrans(bytes(b for b in range(256) if b not in b'0123456789-\n'),
+                             b' ' * (256 - len(b'0123456789-\n')))
+
+# minus signs which aren't right before a digit, like in "seed-to-soil"
+LONE_MINUS = re.compile(rb'-(?!\d)')
+
+
+def only_numbers(data):
+    data = data.translate(NOT_NUMBER)
+    if b'-' in data:
+        data = data.replace(b'-', b' -')
+        if b'- ' in data or b'-\n' in data or data.endswith(b'-'):
+            data = LONE_MINUS.sub(b' ', data)
+    return data
+
+
+def number_lines(text):
+    """
+    Lines of the text as bytes with only integers left in them, separated by spaces. A MappedInput
+    is cleaned line by line, so it's never copied whole.
+    """
+    if isinstance(text, (str, bytes, bytearray)):
+        return only_numbers(text.encode() if isinstance(text, str) else bytes(text)).split(b'\n')
+    return (only_numbers(bytes(line)) for line in text.raw_lines())
+
+
+def scan_ints(text):
+    """
+    All signed integers of a text in one flat array('q') and the offsets of every line's first value,
+    values of line i are values[offsets[i]:offsets[i + 1]]. Works on the whole buffer with bytes
+    translate and split, without a regex match object per number.
+    """
+    values = array('q')
+    offsets = array('q', [0])
+    for line in number_lines(text):
+        values.extend(map(int, line.split()))
+        offsets.append(len(values))
+    return values, offsets
@@ -0,0 +1,128 @@
+import atexit
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+
+from common import share_setting
+from common.sources import REPO_DIR, module_hash
+
+# directory of the on-disk store, results are kept in memory only while it's not set
+ENV_DIR = 'AOC_MEMO_DIR'
+
+# results kept in memory per function, least recently used ones are evicted first
+DEFAULT_SIZE = 2 ** 16
+
+# new results are written to disk in batches of this size, the rest at exit or by save_all()
+SAVE_EVERY = 2 ** 14
+
+MISSING = object()
+
+_stores = {}
+
+# read once, memoized functions are called too often to look into os.environ every time
+_directory = os.environ.get(ENV_DIR)
+
+
+def enable(path=None):
+    """Makes memoized functions also keep their results in SQLite files in path, .cache/memo by default."""
+    global _directory
+    _directory = share_setting(ENV_DIR, path or os.path.join(REPO_DIR, '.cache', 'memo'))
+
+
+def disable():
+    global _directory
+    _directory = share_setting(ENV_DIR, None)
+
+
+class DiskStore:
+    """
+    Results of one function by digest of its arguments in an SQLite file, looked up one key at a
+    time so memory holds only the unsaved ones. SQLite's locking lets parallel parts share the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = None
+        self.pid = None
+        self.stored = False
+        self.new = {}
+
+    def connect(self):
+        if self.connection is None or self.pid != os.getpid():  # a connection can't be used after fork
+            self.pid = os.getpid()
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.connection = sqlite3.connect(self.path, timeout=60)
+            self.connection.execute('PRAGMA journal_mode = WAL')  # readers don't wait for a writer
+            self.connection.execute('CREATE TABLE IF NOT EXISTS results (key BLOB PRIMARY KEY, value BLOB)')
+            # a first run would look up every key in vain
+            self.stored = self.connection.execute('SELECT 1 FROM results LIMIT 1').fetchone() is not None
+        return self.connection
+
+    def get(self, key):
+        if key in self.new:
+            return self.new[key]
+        connection = self.connect()
+        if not self.stored:
+            return MISSING
+        row = connection.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+        return MISSING if row is None else pickle.loads(row[0])
+
+    def put(self, key, value):
+        self.new[key] = value
+        if len(self.new) >= SAVE_EVERY:
+            self.save()
+
+    def save(self):
+        if not self.new:
+            return
+        with self.connect() as connection:  # one transaction
+            connection.executemany('INSERT OR REPLACE INTO results VALUES (?, ?)',
+                                   ((key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+                                    for key, value in self.new.items()))
+        self.new = {}
+        self.stored = True
+
+
+def save_all():
+    """Writes pending results of every store, pool workers exit without running atexit handlers."""
+    for store in _stores.values():
+        store.save()
+
+
+atexit.register(save_all)
+
+
+def memoize(maxsize=DEFAULT_SIZE):
+    """
+    Like functools.cache, but keeps at most maxsize results in memory and, when the disk store is
+    enabled, reuses results of earlier runs. Results are keyed by a digest of the pickled arguments
+    and stored per function and the sources of its day and the repo files the day uses, so editing
+    any of them starts the function with an empty store.
+    Keeps cache_info() and cache_clear() of lru_cache, clearing doesn't touch the disk.
+    """
+
+    def decorator(func):
+        day = os.path.splitext(os.path.basename(inspect.getsourcefile(func)))[0]
+
+        @functools.wraps(func)
+        def lookup(*args, **kwargs):
+            if not _directory:
+                return func(*args, **kwargs)
+            store = _stores.get((_directory, func))
+            if store is None:
+                # the day is still being imported when it's decorated, so its sources are hashed on first use
+                path = os.path.join(_directory, f"{day}.{func.__qualname__}.{module_hash(func)[:16]}.sqlite")
+                store = _stores[(_directory, func)] = DiskStore(path)
+            key = hashlib.sha256(pickle.dumps((args, sorted(kwargs.items())))).digest()
+            value = store.get(key)
+            if value is MISSING:
+                value = func(*args, **kwargs)
+                store.put(key, value)
+            return value
+
+        return functools.lru_cache(maxsize)(lookup)
+
+    return decorator
@@ -0,0 +1,130 @@
+import functools
+import hashlib
+import os
+import pickle
+import struct
+from array import array
+
+from common import share_setting
+from common.sources import REPO_DIR, module_hash
+
+# directory of the on-disk cache, caching is off while it's not set
+ENV_DIR = 'AOC_PARSE_CACHE'
+
+# narrowest array type that fits the values, small numbers like day17's digits take a byte each
+INT_TYPES = [('b', -2 ** 7, 2 ** 7 - 1), ('h', -2 ** 15, 2 ** 15 - 1), ('i', -2 ** 31, 2 ** 31 - 1),
+             ('q', -2 ** 63, 2 ** 63 - 1)]
+
+# encoded parse results of this process, decoded again on every call so parts can mutate them
+_memory = {}
+
+
+def enable(path=None):
+    """Makes cached_parse store and load encoded parse results in path, .cache/parsed by default."""
+    share_setting(ENV_DIR, path or os.path.join(REPO_DIR, '.cache', 'parsed'))
+
+
+def disable():
+    share_setting(ENV_DIR, None)
+
+
+def clear():
+    _memory.clear()
+
+
+def is_int_list(value):
+    return (type(value) is list and len(value) > 0 and all(type(v) is int for v in value)
+            and INT_TYPES[-1][1] <= min(value) and max(value) <= INT_TYPES[-1][2])
+
+
+def is_grid(value):
+    """Equal width rows of text, or of single characters like list(row)."""
+    if type(value) is not list or len(value) == 0:
+        return False
+    if all(type(row) is str for row in value):
+        return len({len(row) for row in value}) == 1 and all(row.isascii() for row in value)
+    return (all(type(row) is list for row in value) and len({len(row) for row in value}) == 1
+            and all(type(c) is str and len(c) == 1 and c.isascii() for row in value for c in row))
+
+
+def is_compact(value):
+    return is_int_list(value) or is_grid(value) or (
+            type(value) in (list, tuple) and len(value) > 0 and all(is_compact(v) for v in value))
+
+
+def encode(value):
+    """
+    Integer lists become arrays and grids one block of bytes, containers made only of those
+    are encoded element by element. Anything else is pickled.
+    """
+    if is_int_list(value):
+        low, high = min(value), max(value)
+        typecode = next(t for t, t_low, t_high in INT_TYPES if t_low <= low and high <= t_high)
+        return b'A' + typecode.encode() + array(typecode, value).tobytes()
+    if is_grid(value):
+        tag = b'G' if type(value[0]) is str else b'C'
+        return tag + struct.pack('<q', len(value)) + ''.join(''.join(row) for row in value).encode('ascii')
+    if is_compact(value):
+        parts = [encode(v) for v in value]
+        return ((b'L' if type(value) is list else b'T') + struct.pack('<q', len(parts)) +
+                b''.join(struct.pack('<q', len(part)) + part for part in parts))
+    return b'P' + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode(data):
+    data = memoryview(data)
+    tag = bytes(data[:1])
+    if tag == b'A':
+        values = array(chr(data[1]))
+        values.frombytes(data[2:])
+        return values.tolist()
+    if tag in (b'G', b'C'):
+        (rows,) = struct.unpack_from('<q', data, 1)
+        text = bytes(data[9:]).decode('ascii')
+        width = len(text) // rows if rows else 0
+        lines = [text[i * width:(i + 1) * width] for i in range(rows)]
+        return lines if tag == b'G' else [list(line) for line in lines]
+    if tag in (b'L', b'T'):
+        (count,) = struct.unpack_from('<q', data, 1)
+        items = []
+        offset = 9
+        for _ in range(count):
+            (length,) = struct.unpack_from('<q', data, offset)
+            items.append(decode(data[offset + 8:offset + 8 + length]))
+            offset += 8 + length
+        return items if tag == b'L' else tuple(items)
+    return pickle.loads(data[1:])
+
+
+def cached_parse(func):
+    """
+    Caches what a day's parse function returns for a given input in a compact binary file, keyed
+    by the input and the source of the day and the repo files it uses, so a change of a class the
+    result pickles, like day22's Cube, or of a helper like scan_ints starts a new entry. Every call
+    returns a fresh copy.
+    """
+
+    @functools.wraps(func)
+    def wrapper(input_data):
+        directory = os.environ.get(ENV_DIR)
+        if not directory or not isinstance(input_data, str):  # a MappedInput is read as it goes
+            return func(input_data)
+        digest = hashlib.sha256(module_hash(func).encode())
+        digest.update(input_data.encode())
+        key = f"{func.__module__}.{func.__name__}.{digest.hexdigest()[:32]}"
+        if key not in _memory:
+            path = os.path.join(directory, key + '.bin')
+            if os.path.exists(path):
+                with open(path, 'rb') as file:
+                    _memory[key] = file.read()
+            else:
+                result = func(input_data)
+                _memory[key] = encode(result)
+                os.makedirs(directory, exist_ok=True)
+                with open(path, 'wb') as file:
+                    file.write(_memory[key])
+                return result
+        return decode(_memory[key])
+
+    return wrapper
+
@@ -0,0 +1,30 @@
+from time import monotonic
+
+# a sink gets at most one update per this many seconds, so reporting from a hot loop stays cheap
+INTERVAL = 0.5
+
+_sink = None
+_sent = 0.0
+
+
+def attach(sink):
+    """Sends progress of the running part to sink(state), e.g. a scheduler which may kill the part."""
+    global _sink, _sent
+    _sink = sink
+    _sent = 0.0
+
+
+def detach():
+    global _sink
+    _sink = None
+
+
+def report_progress(**state):
+    """Last reported state is what run_all shows for a part which ran out of its time budget."""
+    global _sent
+    if _sink is None:
+        return
+    now = monotonic()
+    if now - _sent >= INTERVAL:
+        _sent = now
+        _sink(state)
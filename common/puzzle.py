@@ -0,0 +1,158 @@
+import json
+import os
+import sys
+from collections import namedtuple
+
+from common import share_setting
+
+STORE_DIR = os.environ.get('AOC_STORE', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                     'puzzles'))
+
+Example = namedtuple('Example', ['input_data', 'answer_a', 'answer_b'])
+
+
+def coerce(value):
+    """Mimics how aocd turns an answer into the string it submits."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+class LocalPuzzle:
+    """
+    Follows the interface of aocd's Puzzle, but reads input, examples and expected answers from
+    a local store and records answers instead of submitting them. Store layout:
+
+        <store>/<year>/<day>/input.txt
+        <store>/<year>/<day>/examples.json   [{"input_data": ..., "answer_a": ..., "answer_b": ...}]
+        <store>/<year>/<day>/answers.json    {"answer_a": ..., "answer_b": ...}  expected answers
+        <store>/<year>/<day>/recorded.json   answers given by the last run
+    """
+
+    def __init__(self, year, day, store_dir=None):
+        self.year = year
+        self.day = day
+        self.path = os.path.join(store_dir or STORE_DIR, str(year), f"{day:02}")
+
+    def _read_json(self, name, default):
+        path = os.path.join(self.path, name)
+        if not os.path.exists(path):
+            return default
+        with open(path) as file:
+            return json.load(file)
+
+    @property
+    def input_data(self):
+        with open(os.path.join(self.path, 'input.txt')) as file:
+            return file.read().rstrip('\n')  # aocd strips the trailing newline too
+
+    @property
+    def examples(self):
+        return [Example(e['input_data'], e.get('answer_a'), e.get('answer_b'))
+                for e in self._read_json('examples.json', [])]
+
+    @property
+    def answers(self):
+        return self._read_json('answers.json', {})
+
+    @property
+    def recorded(self):
+        return self._read_json('recorded.json', {})
+
+    def _record(self, part, value):
+        value = coerce(value)
+        recorded = self.recorded
+        recorded[part] = value
+        with open(os.path.join(self.path, 'recorded.json'), 'w') as file:
+            json.dump(recorded, file, indent=2)
+        expected = self.answers.get(part)
+        if expected is not None and expected != value:
+            print(f"day {self.day} {part}: {value} is not the expected {expected}")
+
+    @property
+    def answer_a(self):
+        return self.answers.get('answer_a')
+
+    @answer_a.setter
+    def answer_a(self, value):
+        self._record('answer_a', value)
+
+    @property
+    def answer_b(self):
+        return self.answers.get('answer_b')
+
+    @answer_b.setter
+    def answer_b(self, value):
+        self._record('answer_b', value)
+
+
+def aocd_puzzle(year, day):
+    from aocd.models import Puzzle
+    return Puzzle(year=year, day=day)
+
+
+PROVIDERS = {
+    'aocd': aocd_puzzle,
+    'local': LocalPuzzle,
+}
+
+
+def set_provider(name):
+    """Selects where puzzles come from: 'aocd' fetches and submits, 'local' reads and records in the store."""
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown puzzle provider {name}, expected one of {', '.join(PROVIDERS)}")
+    share_setting('AOC_PROVIDER', name)
+
+
+def get_provider():
+    return PROVIDERS[os.environ.get('AOC_PROVIDER', 'aocd')]
+
+
+class LazyPuzzle:
+    """
+    Stand-in for aocd's Puzzle which builds the real one on first access,
+    so importing a day doesn't pay for aocd's model machinery.
+    """
+
+    def __init__(self, year, day):
+        object.__setattr__(self, 'year', year)
+        object.__setattr__(self, 'day', day)
+        object.__setattr__(self, '_puzzle', None)
+
+    def _load(self):
+        if self._puzzle is None:
+            object.__setattr__(self, '_puzzle', get_provider()(self.year, self.day))
+        return self._puzzle
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+
+def store_puzzle(year, day, store_dir=None):
+    """Copies a puzzle from aocd into the local store, so later runs can work offline."""
+    puzzle = aocd_puzzle(year, day)
+    local = LocalPuzzle(year, day, store_dir)
+    os.makedirs(local.path, exist_ok=True)
+    with open(os.path.join(local.path, 'input.txt'), 'w') as file:
+        file.write(puzzle.input_data)
+    examples = [{'input_data': e.input_data, 'answer_a': e.answer_a, 'answer_b': e.answer_b}
+                for e in puzzle.examples]
+    with open(os.path.join(local.path, 'examples.json'), 'w') as file:
+        json.dump(examples, file, indent=2)
+    answers = {}
+    if puzzle.answered_a:
+        answers['answer_a'] = puzzle.answer_a
+    if puzzle.answered_b:
+        answers['answer_b'] = puzzle.answer_b
+    with open(os.path.join(local.path, 'answers.json'), 'w') as file:
+        json.dump(answers, file, indent=2)
+
+
+if __name__ == '__main__':
+    # python -m common.puzzle 1 2 3  stores given days, all of them by default
+    for store_day in map(int, sys.argv[1:] or range(1, 26)):
+        store_puzzle(2023, store_day)
+        print(f"day {store_day} stored")
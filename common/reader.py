@@ -0,0 +1,103 @@
+import mmap
+import os
+
+
+class MappedInput:
+    """
+    Input file mapped read-only into memory. The OS loads pages on access and can drop them again,
+    so a day can walk a file larger than RAM. Pass it instead of the input string to parts which
+    read their input through lines() or blocks(). start and end limit it to a part of the file,
+    e.g. one of chunks() handled by a worker process.
+    """
+
+    def __init__(self, path, start=0, end=None):
+        self.path = path
+        self.file = open(path, 'rb')
+        if os.fstat(self.file.fileno()).st_size > 0:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:  # empty files can't be mapped
+            self.data = b''
+        self.start = start
+        self.end = len(self.data) if end is None else end
+
+    def __len__(self):
+        return self.end - self.start
+
+    def view(self):
+        return memoryview(self.data)[self.start:self.end]
+
+    def raw_lines(self):
+        return split_views(self.data, b'\n', self.start, self.end)
+
+    def raw_blocks(self):
+        return split_views(self.data, b'\n\n', self.start, self.end)
+
+    def chunks(self, count):
+        """
+        At most count non-empty (start, end) ranges of about equal size which split the input between
+        lines. Trailing newlines are left out, they would end up as an empty last range.
+        """
+        end = self.end
+        while end > self.start and self.data[end - 1] == ord('\n'):
+            end -= 1
+        bounds = []
+        start = self.start
+        for i in range(1, count):
+            newline = self.data.find(b'\n', max(start, self.start + (end - self.start) * i // count), end)
+            if newline == -1:
+                break
+            if newline > start:
+                bounds.append((start, newline))
+            start = newline + 1
+        if end > start:
+            bounds.append((start, end))
+        return bounds
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def split_views(buffer, separator, start=0, end=None):
+    """
+    Zero-copy memoryview slices of a bytes-like buffer between separators, from start to end. Trailing
+    newlines are ignored, like aocd strips them from input_data.
+    """
+    end = len(buffer) if end is None else end
+    while end > start and buffer[end - 1] == ord('\n'):
+        end -= 1
+    view = memoryview(buffer)
+    while start <= end:
+        stop = buffer.find(separator, start, end)
+        if stop == -1:
+            stop = end
+        yield view[start:stop]
+        start = stop + len(separator)
+
+
+def lines(data):
+    """Lines of a str input or of a MappedInput, as str."""
+    if isinstance(data, str):
+        return iter(data.split('\n'))  # already in memory, split is the fastest way through it
+    return (str(line, 'utf-8') for line in data.raw_lines())
+
+
+def blocks(data):
+    """Blocks separated by an empty line of a str input or of a MappedInput, as str."""
+    if isinstance(data, str):
+        return iter(data.split('\n\n'))
+    return (str(block, 'utf-8') for block in data.raw_blocks())
+
+
+def byte_lines(data):
+    """Lines of a str input or of a MappedInput as bytes, for parts which scan bytes."""
+    if isinstance(data, str):
+        return data.encode().split(b'\n')
+    return map(bytes, data.raw_lines())  # a short copy is iterated faster than a memoryview
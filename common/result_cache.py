@@ -0,0 +1,58 @@
+import glob
+import hashlib
+import inspect
+import os
+import pickle
+
+from common.sources import REPO_DIR, source_hash
+
+CACHE_DIR = os.environ.get('AOC_CACHE', os.path.join(REPO_DIR, '.cache', 'results'))
+
+
+def parameters(func, params=None):
+    """Keyword defaults of the part overridden by params, e.g. {'empty_space_size': 2} for day 11."""
+    values = {name: p.default for name, p in inspect.signature(func).parameters.items() if p.default is not p.empty}
+    values.update(params or {})
+    return values
+
+
+def describe(value):
+    """Stable text of a parameter, functions like day14's cycle_det_func by name instead of address."""
+    return getattr(value, '__qualname__', None) or repr(value)
+
+
+def cache_path(module, part, input_data, params=None):
+    digest = hashlib.sha256()
+    digest.update(hashlib.sha256(input_data.encode()).digest())
+    digest.update(source_hash(module).encode())
+    digest.update(part.encode())
+    for name, value in sorted(parameters(getattr(module, part), params).items()):
+        digest.update(f"{name}={describe(value)};".encode())
+    day = module.__name__.split('.')[-1]
+    return os.path.join(CACHE_DIR, f"{day}.{part}.{digest.hexdigest()[:32]}.pickle")
+
+
+def cached_call(module, part, input_data, params=None, use_cache=True):
+    """Returns (answer, cached). Answers are stored whenever the part runs, use_cache=False only skips reading."""
+    path = cache_path(module, part, input_data, params)
+    if use_cache and os.path.exists(path):
+        with open(path, 'rb') as file:
+            return pickle.load(file), True
+    func = inspect.unwrap(getattr(module, part))  # the part itself while run_all's cached_parts replaces it
+    answer = func(input_data, **(params or {}))
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(path, 'wb') as file:
+        pickle.dump(answer, file)
+    return answer, False
+
+
+def invalidate(days=None):
+    """Removes cached answers of given days, all of them by default. Returns the number of removed answers."""
+    patterns = [os.path.join(CACHE_DIR, f"day{day:02}.*.pickle") for day in days] if days is not None else \
+        [os.path.join(CACHE_DIR, '*.pickle')]
+    removed = 0
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            os.remove(path)
+            removed += 1
+    return removed
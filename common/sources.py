@@ -0,0 +1,45 @@
+import hashlib
+import inspect
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# hashes by module name, the sources don't change while a run is going
+_hashes = {}
+
+
+def source_files(module):
+    """
+    The day's file and repo files it imports from, like common helpers or another day's functions,
+    also through those files, so a change of e.g. common/grid.py used by common/graph.py counts too.
+    """
+    files = set()
+    pending = [module]
+    while pending:
+        current = pending.pop()
+        path = getattr(current, '__file__', None)
+        if not path or path in files or not os.path.abspath(path).startswith(REPO_DIR + os.sep):
+            continue
+        files.add(path)
+        for member in vars(current).values():
+            source = member if inspect.ismodule(member) else inspect.getmodule(member)
+            if source is not None:
+                pending.append(source)
+    return sorted(files)
+
+
+def source_hash(module):
+    digest = hashlib.sha256()
+    for path in source_files(module):
+        with open(path, 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def module_hash(func):
+    """source_hash of the function's module, computed once per process on first use."""
+    name = func.__module__
+    if name not in _hashes:
+        _hashes[name] = source_hash(sys.modules[name])
+    return _hashes[name]
@@ -0,0 +1,94 @@
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from time import perf_counter
+
+from common import progress
+
+
+def _run(func, args, connection):
+    progress.attach(lambda state: connection.send(('progress', state)))
+    try:
+        connection.send(('done', func(*args)))
+    except Exception as e:  # reported to the parent instead of a traceback in the worker
+        connection.send(('failed', repr(e)))
+    finally:
+        connection.close()
+
+
+class Watched:
+    """
+    func(*args) running in a process of its own, so it can be killed when it runs over its budget in
+    seconds (None for no limit). It sends back the progress it reports through common/progress.py
+    and then its result.
+    """
+
+    def __init__(self, func, args, budget=None):
+        self.connection, sender = Pipe(duplex=False)
+        self.process = Process(target=_run, args=(func, args, sender))
+        self.process.start()
+        sender.close()  # only the worker writes, recv() fails with EOFError once it's gone
+        self.started = perf_counter()
+        self.ended = None
+        self.deadline = None if budget is None else self.started + budget
+        self.progress = None
+
+    @property
+    def elapsed(self):
+        return (self.ended or perf_counter()) - self.started
+
+    def overdue(self):
+        return self.deadline is not None and perf_counter() >= self.deadline
+
+    def receive(self):
+        """
+        Reads a message once the connection is ready. Returns None for a progress update, else the
+        outcome ('done', result), ('failed', exception) or ('crashed', exit code) and stops the process.
+        """
+        try:
+            kind, value = self.connection.recv()
+        except EOFError:
+            self.stop()
+            return 'crashed', f"exit code {self.process.exitcode}"
+        if kind == 'progress':
+            self.progress = value
+            return None
+        self.stop()
+        return kind, value
+
+    def stop(self):
+        if self.ended is None:
+            self.ended = perf_counter()
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+
+def until_deadline(watched):
+    """Seconds to wait for the nearest deadline of the watched calls, None if none has one."""
+    deadlines = [w.deadline for w in watched if w.deadline is not None]
+    return max(0.0, min(deadlines) - perf_counter()) if deadlines else None
+
+
+def ready(watched):
+    """Waits until one of the watched calls sends a message or runs over its budget, returns those calls."""
+    connections = wait([w.connection for w in watched], until_deadline(watched))
+    return [w for w in watched if w.connection in connections or w.overdue()]
+
+
+def call_with_timeout(func, args, timeout):
+    """func(*args) in a fresh process, TimeoutError if it runs longer than timeout seconds."""
+    watched = Watched(func, args, timeout)
+    while True:
+        if not ready([watched]):
+            continue
+        if watched.connection.poll():
+            outcome = watched.receive()
+            if outcome is None:
+                continue
+            kind, value = outcome
+            if kind == 'done':
+                return value
+            raise RuntimeError(f"{func.__name__}{args} {kind}: {value}")
+        watched.stop()
+        raise TimeoutError(f"{func.__name__}{args} didn't finish in {timeout} s")
@@ -0,0 +1,94 @@
+import argparse
+import math
+import statistics
+
+from benchmark import SLOW_VARIANTS, discover, measure_generated, parse_days
+from common.watchdog import call_with_timeout
+
+# generator size of the first step, small enough for the slowest solvers of the day
+BASE_SIZES = {
+    1: 100, 2: 100, 3: 20, 4: 50, 5: 10, 6: 2, 7: 100, 8: 200, 9: 50, 10: 21, 11: 20, 12: 20, 13: 10,
+    14: 10, 15: 100, 16: 10, 17: 10, 18: 20, 19: 20, 20: 24, 21: 11, 22: 20, 23: 2, 24: 5, 25: 20,
+}
+
+CLASSES = {
+    'n': lambda n: n,
+    'n log n': lambda n: n * math.log(n),
+    'n^2': lambda n: n ** 2,
+    'n^3': lambda n: n ** 3,
+}
+
+
+def measure(day, name, size, seed, repeat, memory):
+    """One step of profile, looked up by name since call_with_timeout sends the arguments to a new process."""
+    return measure_generated(day, discover(day)[name], size, seed, repeat, memory=memory)
+
+
+def fit(points):
+    """
+    Fits y = c * n^k in log-log space. Returns k and the candidate class whose
+    ratio y / f(n) is the most constant over the measured sizes.
+    """
+    points = [(n, y) for n, y in points if y]
+    if len(points) < 3:
+        return None, None
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(y) for _, y in points]
+    mean_x, mean_y = statistics.mean(xs), statistics.mean(ys)
+    exponent = (sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) /
+                sum((x - mean_x) ** 2 for x in xs))
+    spread = {name: statistics.pstdev(y - math.log(f(n)) for (n, _), y in zip(points, ys))
+              for name, f in CLASSES.items()}
+    return exponent, min(spread, key=spread.get)
+
+
+def profile(day, name, steps, factor, seed, repeat, memory, timeout):
+    measurements = []
+    size = BASE_SIZES[day]
+    for _ in range(steps):
+        try:
+            measurements.append(call_with_timeout(measure, (day, name, size, seed, repeat, memory), timeout))
+        except TimeoutError:
+            print(f"{name} size {size} didn't finish in {timeout} s")
+            break
+        except RuntimeError as e:  # the solver raised or its process died
+            print(f"{name} size {size} failed: {e}")
+            break
+        size = math.ceil(size * factor)
+    return measurements
+
+
+def print_fit(name, measurements):
+    time_exponent, time_class = fit([(m['n'], m['time']) for m in measurements])
+    memory_exponent, memory_class = fit([(m['n'], m['peak_memory']) for m in measurements])
+
+    def describe(exponent, cls):
+        return f"{exponent:>5.2f} ~ {cls:<8}" if exponent is not None else f"{'-':>5}   {'':<8}"
+
+    sizes = f"n {measurements[0]['n']}..{measurements[-1]['n']}" if measurements else 'no runs'
+    print(f"{name:<40} time {describe(time_exponent, time_class)}  "
+          f"memory {describe(memory_exponent, memory_class)}  {sizes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit time and memory of every part against generated input size")
+    parser.add_argument('--days', type=parse_days, default=list(range(1, 26)), help="e.g. 1-5,11")
+    parser.add_argument('--steps', type=int, default=5, help="number of sizes in the geometric series")
+    parser.add_argument('--factor', type=float, default=2, help="ratio of consecutive sizes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="the fastest run of each size is used")
+    parser.add_argument('--timeout', type=float, default=60, help="stop growing a part when a size takes longer [s]")
+    parser.add_argument('--all', action='store_true', help="include variants known to be very slow")
+    parser.add_argument('--no-memory', action='store_true', help="don't measure peak memory")
+    args = parser.parse_args()
+    for day in args.days:
+        for name in discover(day):
+            if name in SLOW_VARIANTS and not args.all:
+                continue
+            measurements = profile(day, name, args.steps, args.factor, args.seed, args.repeat,
+                                   not args.no_memory, args.timeout)
+            print_fit(name, measurements)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,45 +1,155 @@
-from re import findall
+import os
+import tempfile
+from collections import deque
+from multiprocessing import Pool, cpu_count
 
-from aocd.models import Puzzle
+from common.puzzle import LazyPuzzle
+from common.reader import MappedInput, byte_lines, lines
 
-puzzle = Puzzle(year=2023, day=1)
+puzzle = LazyPuzzle(year=2023, day=1)
+
+DIGIT_WORDS = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
+
+
+def build_automaton(words):
+    """
+    Aho-Corasick automaton of {word: value} compiled into a DFA: table[state << 8 | byte] is the next
+    state and values[state] the value of a word ending in that state, 0 if none does.
+    """
+    goto = [{}]
+    values = [0]
+    for word, value in words.items():
+        state = 0
+        for byte in word.encode():
+            if byte not in goto[state]:
+                goto[state][byte] = len(goto)
+                goto.append({})
+                values.append(0)
+            state = goto[state][byte]
+        values[state] = value
+    table = [0] * (len(goto) << 8)
+    fail = [0] * len(goto)
+    queue = deque()
+    for byte, state in goto[0].items():
+        table[byte] = state
+        queue.append(state)
+    while queue:  # breadth first, so the fail state of every state is finished before it
+        state = queue.popleft()
+        values[state] = values[state] or values[fail[state]]
+        for byte in range(256):
+            target = goto[state].get(byte)
+            if target is None:
+                table[state << 8 | byte] = table[fail[state] << 8 | byte]
+            else:
+                fail[target] = table[fail[state] << 8 | byte]
+                table[state << 8 | byte] = target
+                queue.append(target)
+    return table, values
+
+
+# no digit word contains another one, so the first match to end is also the first one to start
+SPELLED_DIGITS = {**{str(value): value for value in range(1, 10)},
+                  **{word: value for value, word in enumerate(DIGIT_WORDS, 1)}}
+FORWARD = build_automaton(SPELLED_DIGITS)
+BACKWARD = build_automaton({word[::-1]: value for word, value in SPELLED_DIGITS.items()})
 
 
 def part1(data_input):
     result = 0
-    for line in data_input.split('\n'):
+    for line in lines(data_input):
         digits = list(filter(lambda x: x.isnumeric(), str(line)))
         number = int(digits[0] + digits[-1])
         result += number
     return result
 
 
-def part2(data_input):
-    def text_to_number(text):
-        return {
-            'one': '1',
-            'two': '2',
-            'three': '3',
-            'four': '4',
-            'five': '5',
-            'six': '6',
-            'seven': '7',
-            'eight': '8',
-            'nine': '9'
-        }.get(text, text)
+def digit_sum(buffer):
+    """
+    Sum of the two digit numbers of every line of a bytes-like buffer, without a Python object per line:
+    digit positions are found with a mask, matched to their line by the newline positions and the
+    first and last digit of every line picked where the line number changes. Lines need a digit.
+    """
+    import numpy as np  # only this part needs it
 
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    positions = np.flatnonzero((data >= ord('0')) & (data <= ord('9')))
+    if not len(positions):
+        return 0
+    line_of = np.searchsorted(np.flatnonzero(data == ord('\n')), positions)
+    new_line = np.flatnonzero(line_of[1:] != line_of[:-1]) + 1
+    firsts = np.concatenate(([0], new_line))
+    lasts = np.concatenate((new_line - 1, [len(positions) - 1]))
+    digits = data[positions].astype(np.int64) - ord('0')
+    return int(10 * digits[firsts].sum() + digits[lasts].sum())
+
+
+def part1_numpy(data_input):
+    return digit_sum(data_input.encode() if isinstance(data_input, str) else data_input.view())
+
+
+def part2(data_input):
+    forward_table, forward_values = FORWARD
+    backward_table, backward_values = BACKWARD
     result = 0
-    for line in data_input.split('\n'):
-        digits = findall(r'(?=([1-9]{1}|one|two|three|four|five|six|seven|eight|nine))', str(line))
-        first = text_to_number(digits[0])
-        last = text_to_number(digits[-1])
-        number = int(first + last)
-        result += number
+    for line in byte_lines(data_input):
+        # both scans stop at their first match, the middle of a line is usually never read
+        state = 0
+        for byte in line:
+            state = forward_table[state << 8 | byte]
+            if forward_values[state]:
+                break
+        first = forward_values[state]
+        state = 0
+        for byte in reversed(line):
+            state = backward_table[state << 8 | byte]
+            if backward_values[state]:
+                break
+        result += 10 * first + backward_values[state]
     return result
 
 
+def solve_chunk(task):
+    part, path, start, end = task
+    with MappedInput(path, start, end) as chunk:
+        return part(chunk)
+
+
+def solve_parallel(part, data_input, workers=None):
+    """
+    Sums a part over newline aligned chunks of a MappedInput on a process pool, every worker maps
+    the file itself. A str input is already in memory and is solved in this process.
+    """
+    if isinstance(data_input, str):
+        return part(data_input)
+    workers = workers or cpu_count()
+    tasks = [(part, data_input.path, start, end) for start, end in data_input.chunks(4 * workers)]
+    with Pool(workers) as pool:
+        return sum(pool.imap_unordered(solve_chunk, tasks))
+
+
+def part1_parallel(data_input, workers=None):
+    return solve_parallel(part1, data_input, workers)
+
+
+def part2_parallel(data_input, workers=None):
+    return solve_parallel(part2, data_input, workers)
+
+
+def check_parallel(part, data_input, expected):
+    """Runs a parallel part on the input saved with a trailing newline, split into more chunks than lines."""
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as file:
+        file.write(data_input + '\n')
+    try:
+        with MappedInput(file.name) as mapped:
+            assert expected == part(mapped, workers=2)
+    finally:
+        os.remove(file.name)
+
+
 def main():
     assert 142 == part1(puzzle.examples[0].input_data)
+    assert 142 == part1_numpy(puzzle.examples[0].input_data)
+    check_parallel(part1_parallel, puzzle.examples[0].input_data, 142)
 
     puzzle.answer_a = part1(puzzle.input_data)
     print("part1 ok")
@@ -53,6 +163,7 @@ def main():
                    "7pqrstsixteen")
 
     assert 281 == part2(input_part2)
+    check_parallel(part2_parallel, input_part2, 281)
 
     puzzle.answer_b = part2(puzzle.input_data)
     print("part2 OK")
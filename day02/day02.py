@@ -1,65 +1,106 @@
 import re
-from collections import defaultdict
-from functools import reduce
+from array import array
 
-from aocd.models import Puzzle
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
+from common.reader import lines
 
-puzzle = Puzzle(year=2023, day=2)
+puzzle = LazyPuzzle(year=2023, day=2)
 
+# a count and which color it is, blue when neither red nor green matched
+CUBES = re.compile(r'(\d+) (?:(r)|(g)|b)')
 
+
+@cached_parse
 def parse(data_input):
-    games = []
-    for line in data_input.split("\n"):
-        game_input, cubes_input = line.split(":")
-        subsets_intput = cubes_input.split(";")
-        subsets = []
-        for subset in subsets_intput:
-            dices_input = subset.split(",")
-            cubes = []
-            for dice_input in dices_input:
-                dice_match = re.search(" (?P<dices>([0-9]+)) (?P<color>(red|green|blue))", dice_input)
-                dice = int(dice_match.group("dices"))
-                color = dice_match.group("color")
-                cubes.append((dice, color))
-            subsets.append(cubes)
-        games.append(subsets)
-    return games
+    """Most cubes of each color shown in every game, as columns (reds, greens, blues) indexed by game."""
+    reds, greens, blues = [], [], []
+    for line in lines(data_input):
+        red = green = blue = 0
+        for count, is_red, is_green in CUBES.findall(line):
+            count = int(count)
+            if is_red:
+                red = max(red, count)
+            elif is_green:
+                green = max(green, count)
+            else:
+                blue = max(blue, count)
+        reds.append(red)
+        greens.append(green)
+        blues.append(blue)
+    return array('q', reds), array('q', greens), array('q', blues)
+
+
+def possible_sums(games, limits):
+    """
+    Sum of ids of games possible with each (red, green, blue) bag limit, for many limits at once.
+    Games are added in order of their red count and limits answered in order of their red limit, so a
+    game is possible for a limit when it's already added and dominated in green and blue, which is a
+    prefix sum of a 2D Fenwick tree over green and blue counts.
+    """
+    reds, greens, blues = games
+    width, height = max(greens, default=0) + 1, max(blues, default=0) + 1
+    tree = [0] * ((width + 1) * (height + 1))
+    by_red = sorted(range(len(reds)), key=reds.__getitem__)
+    added = 0
+    sums = [0] * len(limits)
+    for query in sorted(range(len(limits)), key=lambda q: limits[q][0]):
+        red, green, blue = limits[query]
+        while added < len(by_red) and reds[by_red[added]] <= red:
+            game = by_red[added]
+            x = greens[game] + 1
+            while x <= width:
+                y = blues[game] + 1
+                while y <= height:
+                    tree[x * (height + 1) + y] += game + 1
+                    y += y & -y
+                x += x & -x
+            added += 1
+        total = 0
+        x = min(green, width - 1) + 1 if green >= 0 else 0
+        while x > 0:
+            y = min(blue, height - 1) + 1 if blue >= 0 else 0
+            while y > 0:
+                total += tree[x * (height + 1) + y]
+                y -= y & -y
+            x -= x & -x
+        sums[query] = total
+    return sums
 
 
 def part1(data_input):
-    games = parse(data_input)
-    possible_cubes = {
-        'red': 12,
-        'green': 13,
-        "blue": 14
-    }
-    possible_games = 0
-    for idx, game in enumerate(games):
-        possible = True
-        for subset in game:
-            for cubes, color in subset:
-                limit = possible_cubes.get(color)
-                if limit < cubes:
-                    possible = False
-        if possible:
-            possible_games += idx + 1
-    return possible_games
+    return possible_sums(parse(data_input), [(12, 13, 14)])[0]
 
 
-def part2(data_input):
-    games = parse(data_input)
+def part1_streaming(data_input, limits=(12, 13, 14)):
+    """
+    Checks each game while reading its draws and leaves it at the first one over the limit, so
+    impossible games are read only up to that draw. Game ids are taken from the input.
+    """
+    red_limit, green_limit, blue_limit = limits
     result = 0
-    for game in games:
-        min_dices = defaultdict(int)
-        for subset in game:
-            for cubes, color in subset:
-                min_dices[color] = max(min_dices[color], cubes)
-        result += reduce(lambda x, y: x * y, min_dices.values())
+    for line in lines(data_input):
+        game, _, draws = line.partition(':')
+        for cube in CUBES.finditer(draws):
+            count, is_red, is_green = cube.groups()
+            if int(count) > (red_limit if is_red else green_limit if is_green else blue_limit):
+                break
+        else:
+            result += int(game[len('Game '):])
     return result
 
 
+def part2(data_input):
+    reds, greens, blues = parse(data_input)
+    # a color a game never shows doesn't count, as if one such cube was needed
+    return sum((red or 1) * (green or 1) * (blue or 1) for red, green, blue in zip(reds, greens, blues))
+
+
 def main():
     assert 8 == part1(puzzle.examples[0].input_data)
+    assert 8 == part1_streaming(puzzle.examples[0].input_data)
+    assert [8, 15, 0, 8, 2] == possible_sums(parse(puzzle.examples[0].input_data),
+                                             [(12, 13, 14), (20, 13, 15), (0, 0, 0), (6, 3, 6), (4, 3, 4)])
 
     puzzle.answer_a = part1(puzzle.input_data)
     print("part1 ok")
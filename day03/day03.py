@@ -1,97 +1,50 @@
 import re
 
-from aocd.models import Puzzle
-
-puzzle = Puzzle(year=2023, day=3)
-
-eight_neighbours = [
-    (0, 1),
-    (1, 1),
-    (1, 0),
-    (1, -1),
-    (0, -1),
-    (-1, -1),
-    (-1, 0),
-    (-1, 1),
-]
-
-
-def adjacent(y, x, size_x, size_y, neighbourhood):
-    result = []
-    for dy, dx in neighbourhood:
-        ny, nx = dy + y, dx + x
-        if ny >= size_y or ny < 0:
-            continue
-        if nx >= size_x or nx < 0:
-            continue
-        result.append((ny, nx))
-    return result
+from common.grid import Grid
+from common.puzzle import LazyPuzzle
+
+puzzle = LazyPuzzle(year=2023, day=3)
 
+DOT, GEAR, DIGIT_0, DIGIT_9 = b'.*09'
 
-def get_number(string, position):
-    start_char = string[position]
-    prefix = ""
-    for x in range(position - 1, -1, -1):
-        if string[x].isdigit():
-            prefix = string[x] + prefix
-        else:
-            break
-    suffix = ""
-    for x in range(position + 1, len(string)):
-        if string[x].isdigit():
-            suffix += string[x]
-        else:
-            break
-    number = prefix + start_char + suffix
-    return number, len(suffix)  # return number and how long it is after encountered digit
+
+def number_ids(grid):
+    """Maps every cell of a number to the number's position in the returned list of numbers."""
+    ids = [-1] * len(grid.cells)
+    numbers = []
+    for y in range(grid.height):
+        row_start = grid.index(y, 0)
+        for group in re.finditer(rb'[0-9]+', grid.row(y)):
+            number_start, number_end = group.span()
+            ids[row_start + number_start:row_start + number_end] = [len(numbers)] * (number_end - number_start)
+            numbers.append(int(group.group()))
+    return ids, numbers
 
 
 def part1(data_input):
-    board = data_input.split('\n')
-    mask = [[False for _ in line] for line in board]
-    # find adjacent numbers
-    for y, line in enumerate(board):
-        for x, c in enumerate(line):
-            if not c.isdigit() and c != '.':
-                neighbours = adjacent(y, x, len(board), len(line), eight_neighbours)
-                for ny, nx in neighbours:
-                    if board[ny][nx].isdigit():
-                        mask[ny][nx] = True  # mark mask if any adjacent number
-    result = 0
-    for y, line in enumerate(mask):
-        x = 0
-        while x < len(line):
-            if line[x] is True and board[y][x].isdigit():
-                number, length_after = get_number(board[y], x)
-                result += int(number)
-                x += length_after  # skip number to count it once
-            x += 1
-    return result
+    board = Grid.from_text(data_input, border='.')
+    ids, numbers = number_ids(board)
+    # find numbers adjacent to any symbol, set counts each once
+    adjacent = set()
+    for i in board.indices():
+        c = board.cells[i]
+        if c != DOT and not DIGIT_0 <= c <= DIGIT_9:
+            for offset in board.neighbours8:
+                if ids[i + offset] != -1:
+                    adjacent.add(ids[i + offset])
+    return sum(numbers[idx] for idx in adjacent)
 
 
 def part2(data_input):
-    board = data_input.split('\n')
-    mask = [[-1 for _ in line] for line in board]  # mask allowing mapping y,x to number
-    numbers = []  # list of all available numbers
-    for y, line in enumerate(board):
-        for group in re.finditer(r'[0-9]+', line):
-            number_start = group.span()[0]
-            number_end = group.span()[1]
-            number_len = number_end - number_start
-            mask[y][number_start:number_end] = [len(numbers) for _ in range(number_len)]
-            numbers.append(int(group.group()))
+    board = Grid.from_text(data_input, border='.')
+    ids, numbers = number_ids(board)  # mask allowing mapping cell to number
     result = 0
-    for y, line in enumerate(board):
-        for x, c in enumerate(line):
-            if c == '*':
-                number_indices = set()  # avoid duplication with set
-                neighbours = adjacent(y, x, len(board), len(line), eight_neighbours)
-                for ny, nx in neighbours:
-                    if board[ny][nx].isdigit():
-                        number_indices.add(mask[ny][nx])
-                if len(number_indices) == 2:
-                    neighbour_numbers = [numbers[idx] for idx in number_indices]
-                    result += neighbour_numbers[0] * neighbour_numbers[1]
+    for i in board.indices():
+        if board.cells[i] == GEAR:
+            number_indices = {ids[i + offset] for offset in board.neighbours8} - {-1}  # avoid duplication with set
+            if len(number_indices) == 2:
+                neighbour_numbers = [numbers[idx] for idx in number_indices]
+                result += neighbour_numbers[0] * neighbour_numbers[1]
     return result
 
 
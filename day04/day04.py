@@ -1,20 +1,22 @@
-import re
 from typing import Set, Tuple, List
 
-from aocd.models import Puzzle
+from common.ints import scan_ints
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
+from common.reader import lines
 
-puzzle = Puzzle(year=2023, day=4)
+puzzle = LazyPuzzle(year=2023, day=4)
 
 
+@cached_parse
 def parse(data_input) -> List[Tuple[Set[int], Set[int]]]:
-    lines = data_input.split("\n")
+    first_line = next(lines(data_input))
+    winning_amount = len(first_line[first_line.index(":") + 1:first_line.index("|")].split())
+    values, offsets = scan_ints(data_input)
     parsed_cards = []
-    for line in lines:
-        _, cards = re.split(": +", line)
-        winning, appeared = re.split(r" \| +", cards)
-        winning_number = set(map(lambda x: int(x), re.split(" +", winning)))
-        appeared_number = set(map(lambda x: int(x), re.split(" +", appeared)))
-        parsed_cards.append((winning_number, appeared_number))
+    for start, end in zip(offsets, offsets[1:]):  # every card has the same amount of winning numbers
+        middle = start + 1 + winning_amount  # after the card id and the winning numbers
+        parsed_cards.append((set(values[start + 1:middle]), set(values[middle:end])))
     return parsed_cards
 
 
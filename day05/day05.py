@@ -1,28 +1,26 @@
-import re
 from typing import List
 
-from aocd.models import Puzzle
-from tqdm import tqdm
+from common.ints import scan_ints
+from common.intervals import Interval
+from common.parse_cache import cached_parse
+from common.progress import report_progress
+from common.puzzle import LazyPuzzle
 
-puzzle = Puzzle(year=2023, day=5)
+puzzle = LazyPuzzle(year=2023, day=5)
 
 
+@cached_parse
 def parse(data_input):
-    def parse_mappings(loc_mappings):
-        parsed = []
-        for line in loc_mappings.split("\n")[1:]:
-            parsed.append(list(map(int, line.split(" "))))
-        return parsed
-
-    lines = data_input.split("\n\n")
-    seeds = list(map(int, re.findall("[0-9]+", lines[0][6:])))
-    seed2soil = parse_mappings(lines[1])
-    soil2fertilizer = parse_mappings(lines[2])
-    fertilizer2water = parse_mappings(lines[3])
-    water2light = parse_mappings(lines[4])
-    light2temp = parse_mappings(lines[5])
-    temp2humidity = parse_mappings(lines[6])
-    humidity2location = parse_mappings(lines[7])
+    values, offsets = scan_ints(data_input)
+    # map names like "seed-to-soil map:" have no numbers, so they separate blocks like empty lines
+    blocks = [[]]
+    for start, end in zip(offsets, offsets[1:]):
+        if end > start:
+            blocks[-1].append(values[start:end])
+        elif blocks[-1]:
+            blocks.append([])
+    (seeds,), seed2soil, soil2fertilizer, fertilizer2water, water2light, light2temp, temp2humidity, \
+        humidity2location = filter(None, blocks)
     return (seeds, [seed2soil, soil2fertilizer, fertilizer2water,
                     water2light, light2temp, temp2humidity, humidity2location])
 
@@ -65,18 +63,8 @@ def reverse_mappings(mappings: List[List[List[int]]]):
     return new_mapping
 
 
-class Range:
-    def __init__(self):
-        self.ranges = []
-
-    def add_range(self, range_from, range_to):
-        self.ranges.append((range_from, range_to))
-
-    def contains(self, value):
-        for range_from, range_to in self.ranges:
-            if range_from <= value < range_to:
-                return True
-        return False
+def seed_intervals(seeds):
+    return [Interval(seeds[idx], seeds[idx] + seeds[idx + 1]) for idx in range(0, len(seeds), 2)]
 
 
 def find_seed(location, mappings):
@@ -91,26 +79,53 @@ def find_seed(location, mappings):
     return seed
 
 
-def part2(input_data):
+def part2_reverse_search(input_data):
+    from tqdm import tqdm
+
     progress = tqdm()
     (seeds, mappings) = parse(input_data)
     mappings = reverse_mappings(mappings)
     location = 0
-    seeds_range = Range()
-    for idx in range(0, len(seeds), 2):
-        seeds_range.add_range(seeds[idx], seeds[idx] + seeds[idx + 1])
+    seeds_ranges = seed_intervals(seeds)
     while True:
         seed = find_seed(location, mappings)
-        if seeds_range.contains(seed):
+        if any(seed in seeds_range for seeds_range in seeds_ranges):
             progress.clear()
             return location
         location += 1
         if location % 500_000 == 0:
             progress.update(location)
+            report_progress(location=location)
         if location > 1_000_000_000:
             raise RuntimeError("Location not found :(")
 
 
+def map_intervals(intervals, mapping):
+    """Splits intervals on the source ranges of a mapping, moving the parts inside them."""
+    mapped = []
+    for interval in intervals:
+        pending = [interval]
+        for destination, source, length in mapping:
+            source_range = Interval(source, source + length)
+            outside = []
+            for part in pending:
+                inside = part & source_range
+                if inside:
+                    mapped.append(inside.shifted(destination - source))
+                outside += part.difference(source_range)
+            pending = outside
+        mapped += pending
+    return mapped
+
+
+def part2(input_data):
+    (seeds, mappings) = parse(input_data)
+    intervals = seed_intervals(seeds)
+    for mapping in mappings:
+        intervals = map_intervals(intervals, mapping)
+    return min(interval.start for interval in intervals)
+
+
 def main():
     assert 35 == part1(puzzle.examples[0].input_data)
     print("part1 example OK")
@@ -118,11 +133,14 @@ def main():
     puzzle.answer_a = part1(puzzle.input_data)
     print("part1 OK")
 
+    assert 46 == part2_reverse_search(puzzle.examples[0].input_data)
+    print("\npart2 reverse search example OK")
+
     assert 46 == part2(puzzle.examples[0].input_data)
-    print("\npart2 example OK")
+    print("part2 example OK")
 
     puzzle.answer_b = part2(puzzle.input_data)
-    print("\npart2 OK")
+    print("part2 OK")
 
 
 if __name__ == '__main__':
@@ -1,17 +1,15 @@
-import re
 from functools import reduce
 from math import sqrt, floor, ceil
 
-from aocd.models import Puzzle
+from common.ints import scan_ints
+from common.puzzle import LazyPuzzle
 
-puzzle = Puzzle(year=2023, day=6)
+puzzle = LazyPuzzle(year=2023, day=6)
 
 
 def parse_part1(input_data):
-    lines = input_data.split("\n")
-    time = map(int, re.findall("[0-9]+", lines[0]))
-    dist = map(int, re.findall("[0-9]+", lines[1]))
-    return time, dist
+    values, offsets = scan_ints(input_data)
+    return values[:offsets[1]], values[offsets[1]:offsets[2]]
 
 
 def part1(input_data):
@@ -27,9 +25,7 @@ def part1(input_data):
 
 
 def parse_part2(input_data):
-    lines = input_data.split("\n")
-    time = int(''.join(re.findall("[0-9]+", lines[0])))
-    dist = int(''.join(re.findall("[0-9]+", lines[1])))
+    time, dist = (int(''.join(map(str, row))) for row in parse_part1(input_data))
     return time, dist
 
 
@@ -1,9 +1,11 @@
 from collections import Counter
 from functools import cmp_to_key
 
-from aocd.models import Puzzle
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
+from common.reader import lines
 
-puzzle = Puzzle(year=2023, day=7)
+puzzle = LazyPuzzle(year=2023, day=7)
 
 FIVE = 7
 FOUR = 6
@@ -50,9 +52,10 @@ def compare_cards(lhs, rhs):
     return 0
 
 
+@cached_parse
 def parse(input_data):
     parsed = []
-    for line in input_data.split("\n"):
+    for line in lines(input_data):
         cards, bid = line.split(" ")
         parsed.append((cards, int(bid)))
     return parsed
@@ -1,59 +1,77 @@
 from functools import reduce
 
-from aocd.models import Puzzle
+from common.graph import Graph
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-puzzle = Puzzle(year=2023, day=8)
+puzzle = LazyPuzzle(year=2023, day=8)
 
 
+@cached_parse
 def parse(input_data):
     moves, input_lines = input_data.split("\n\n")
     graph = {}
     for line in input_lines.split("\n"):
         node, left, right = line[:3], line[7:10], line[12:15]
         graph[node] = (left, right)
-    return moves, graph
+    return moves, Graph.from_adjacency(graph)
 
 
-def part1(input_data):
-    moves, graph = parse(input_data)
-    step = 0
-    node = 'AAA'
-    while node != 'ZZZ':
-        move = moves[step % len(moves)]
+def edge_choices(moves):
+    """Moves as the edge to take, node's edges are stored left first."""
+    choices = []
+    for move in moves:
         if move == 'L':
-            node = graph[node][0]
+            choices.append(0)
         elif move == 'R':
-            node = graph[node][1]
+            choices.append(1)
         else:
             raise RuntimeError('Unknown move')
+    return choices
+
+
+def nodes_ending_with(graph, letter):
+    return [node for node, name in enumerate(graph.labels.names) if name[-1] == letter]
+
+
+def end_flags(graph):
+    is_end = bytearray(len(graph))
+    for node in nodes_ending_with(graph, 'Z'):
+        is_end[node] = 1
+    return is_end
+
+
+def part1(input_data):
+    moves, graph = parse(input_data)
+    choices = edge_choices(moves)
+    offsets, targets = graph.offsets.tolist(), graph.targets.tolist()
+    step = 0
+    node = graph.labels['AAA']
+    exit_node = graph.labels['ZZZ']
+    while node != exit_node:
+        node = targets[offsets[node] + choices[step % len(choices)]]
         step += 1
     return step
 
 
 def part2(input_data):
     moves, graph = parse(input_data)
-    nodes = list(filter(lambda x: x[-1] == 'A', graph.keys()))
+    choices = edge_choices(moves)
+    offsets, targets = graph.offsets.tolist(), graph.targets.tolist()
+    nodes = nodes_ending_with(graph, 'A')
+    is_end = end_flags(graph)
     step = 0
-    while not all(map(lambda x: x[-1] == 'Z', nodes)):
-        move = moves[step % len(moves)]
-        new_nodes = []
-        for node in nodes:
-            if move == 'L':
-                new_nodes.append(graph[node][0])
-            elif move == 'R':
-                new_nodes.append(graph[node][1])
-            else:
-                raise RuntimeError('Unknown move')
+    while not all(map(is_end.__getitem__, nodes)):
+        choice = choices[step % len(choices)]
+        nodes = [targets[offsets[node] + choice] for node in nodes]
         step += 1
-        nodes = new_nodes
     return step
 
 
-def walk_from_node(node, moves, graph):
+def walk_from_node(node, choices, successors, is_end):
     step = 0
-    while node[-1] != 'Z':
-        move = moves[step % len(moves)]
-        node = graph[node][0 if move == 'L' else 1]
+    while not is_end[node]:
+        node = successors[node][choices[step % len(choices)]]
         step += 1
     return step
 
@@ -77,10 +95,13 @@ def lcm(a, b):
 
 def part2_faster(input_data):
     moves, graph = parse(input_data)
-    nodes = list(filter(lambda x: x[-1] == 'A', graph.keys()))
+    choices = edge_choices(moves)
+    nodes = nodes_ending_with(graph, 'A')
+    successors = [graph.neighbours(node).tolist() for node in range(len(graph))]
+    is_end = end_flags(graph)
     nodes_length = []
     for node in nodes:
-        length = walk_from_node(node, moves, graph)
+        length = walk_from_node(node, choices, successors, is_end)
         nodes_length.append(length)
     steps = int(reduce(lambda x, y: lcm(x, y), nodes_length))
     return steps
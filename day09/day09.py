@@ -1,16 +1,15 @@
-from re import findall
+from common.ints import scan_ints
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-from aocd.models import Puzzle
-
-puzzle = Puzzle(year=2023, day=9)
+puzzle = LazyPuzzle(year=2023, day=9)
 
 
+@cached_parse
 def parse(input_data):
-    data = []
-    for line in input_data.split("\n"):
-        number = list(map(int, findall(r"-?\d+", line)))
-        data.append(number)
-    return data
+    values, offsets = scan_ints(input_data)
+    # array slices, a series takes 8 bytes per number and still grows by append and insert
+    return [values[start:end] for start, end in zip(offsets, offsets[1:])]
 
 
 def find_differences(numbers):
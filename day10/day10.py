@@ -1,6 +1,8 @@
-from aocd.models import Puzzle
+from common.grid import Grid
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-puzzle = Puzzle(year=2023, day=10)
+puzzle = LazyPuzzle(year=2023, day=10)
 
 UP = (-1, 0)
 DOWN = (1, 0)
@@ -22,41 +24,42 @@ PIPES = {
 SIDES = [UP, DOWN, LEFT, RIGHT]
 
 
+def pipe_offsets(board):
+    """Offsets of both ends of every pipe in this board's layout, all sides for the start."""
+    pipes = {ord(symbol): [dy * board.stride + dx for dy, dx in sides] for symbol, sides in PIPES.items()}
+    pipes[ord(START_SYMBOL)] = [dy * board.stride + dx for dy, dx in SIDES]
+    return pipes
+
+
+@cached_parse
 def parse(input_data):
-    data = input_data.split("\n")
-    start = None
-    for y, row in enumerate(data):
-        for x, char in enumerate(row):
-            if char == START_SYMBOL:
-                start = (y, x)
-    assert start is not None, f"No starting node"
+    board = Grid.from_text(input_data)  # border cells are zero, so walks stop there
+    start = board.find(START_SYMBOL)
+    assert start != -1, f"No starting node"
+    pipes = pipe_offsets(board)
+    start_symbol = ord(START_SYMBOL)
 
     def dfs(start_node):
         visited = []
+        seen = set()
         nodes = [start_node]
         while True:
             node = nodes.pop()
-            symbol = data[node[0]][node[1]]
-            if node in visited and symbol != START_SYMBOL:
+            symbol = board.cells[node]
+            if node in seen and symbol != start_symbol:
                 continue
             if len(visited) > 1 and node == visited[-2]:  # don't go back after one pipe
                 continue
             if len(visited) > 1 and node == start:  # visit something
                 return visited
             visited.append(node)
-            if symbol == 'S':
-                neighbours = [UP, DOWN, LEFT, RIGHT]
-            else:
-                neighbours = PIPES[symbol]
-            for neighbour in neighbours:
-                ny, nx = node[0] + neighbour[0], node[1] + neighbour[1]
-                if ny < 0 or ny >= len(data) or nx < 0 or nx >= len(data[0]):
-                    continue
-                nodes.append((ny, nx))
-        return None
+            seen.add(node)
+            for neighbour in pipes[symbol]:
+                if board.cells[node + neighbour] != board.border:
+                    nodes.append(node + neighbour)
 
     loop = dfs(start)
-    return loop, data
+    return loop, board
 
 
 def part1(input_data):
@@ -66,8 +69,9 @@ def part1(input_data):
 
 def part2(input_data):
     loop, board = parse(input_data)
-    # scale up the map x2 and mark pipes in loop
-    mask = [[False for _ in range(2 * len(board[0]))] for _ in range(2 * len(board))]
+    # scale up the map x2 and mark pipes in loop, border cells count as marked
+    mask = Grid(2 * board.width, 2 * board.height, border=1, fill=0)
+    loop = [board.position(node) for node in loop]
     for idx, (ny, nx) in enumerate(loop + [loop[0]]):
         py, px = loop[idx - 1]
         cy, cx = (ny, nx)
@@ -77,37 +81,30 @@ def part2(input_data):
             px, cx = cx, px
         if py != cy:
             for y in range(2 * py, 2 * cy + 1):
-                mask[y][px * 2] = True
+                mask[y, px * 2] = 1
         elif px != cx:
             for x in range(2 * px, 2 * cx + 1):
-                mask[py * 2][x] = True
-    if mask[0][0]:
+                mask[py * 2, x] = 1
+    if mask[0, 0]:
         raise RuntimeError("Left top corner is occupies by pipe")
     # bff from corner and mark
-    queue = [(0, 0)]
+    cells = mask.cells
+    queue = [mask.index(0, 0)]
     while len(queue) > 0:
-        y, x = queue.pop()
-        if mask[y][x]:
+        node = queue.pop()
+        if cells[node]:
             continue
-        mask[y][x] = True
-
-        for side in SIDES:
-            ny, nx = y + side[0], x + side[1]
-            if ny < 0 or ny >= len(mask) or nx < 0 or nx >= len(mask[0]):
-                continue
-            if not mask[ny][nx]:
-                queue.append((ny, nx))
+        cells[node] = 1
+        for side in mask.neighbours4:
+            if not cells[node + side]:
+                queue.append(node + side)
 
-    # for line in mask:
-    #     for c in line:
-    #         print('X' if c else '.', end='')
-    #     print()
-    # print("\n")
+    # print(mask)
 
     inside = 0
-    for y, line in enumerate(board):
-        for x, char in enumerate(line):
-            if not mask[y * 2][x * 2]:
+    for y in range(board.height):
+        for x in range(board.width):
+            if not mask[y * 2, x * 2]:
                 inside += 1
     return inside
 
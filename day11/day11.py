@@ -1,8 +1,10 @@
-from aocd.models import Puzzle
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-puzzle = Puzzle(year=2023, day=11)
+puzzle = LazyPuzzle(year=2023, day=11)
 
 
+@cached_parse
 def parse(input_data):
     data = input_data.split("\n")
     empty_rows = []
@@ -52,11 +54,19 @@ def solve(input_data, empty_space_size):
     return result
 
 
+def part1(input_data, empty_space_size=2):
+    return solve(input_data, empty_space_size)
+
+
+def part2(input_data, empty_space_size=1000000):
+    return solve(input_data, empty_space_size)
+
+
 def main():
     assert 374 == solve(puzzle.examples[0].input_data, 2)
     print("part1 example OK")
 
-    puzzle.answer_a = solve(puzzle.input_data, 2)
+    puzzle.answer_a = part1(puzzle.input_data)
     print("part1 OK")
 
     assert 1030 == solve(puzzle.examples[0].input_data, 10)
@@ -65,7 +75,7 @@ def main():
     assert 8410 == solve(puzzle.examples[0].input_data, 100)
     print("part2 example 2 OK")
 
-    puzzle.answer_b = solve(puzzle.input_data, 1000000)
+    puzzle.answer_b = part2(puzzle.input_data)
     print("part2 OK")
 
 
@@ -1,21 +1,24 @@
 import re
-from functools import cache
 from itertools import islice
 
-from aocd.models import Puzzle
+from common.memo import memoize
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
+from common.reader import lines
 
-puzzle = Puzzle(year=2023, day=12)
+puzzle = LazyPuzzle(year=2023, day=12)
 
 DEBUG = False
 
 
+@cached_parse
 def parse(input_data):
-    lines = []
-    for line in input_data.split("\n"):
+    records = []
+    for line in lines(input_data):
         springs, groups = line.split(" ")
         groups = list(map(int, groups.split(",")))
-        lines.append((springs, groups))
-    return lines
+        records.append((springs, groups))
+    return records
 
 
 def correct_arrangement(springs, groups):
@@ -85,7 +88,7 @@ def can_group_start(pattern, group_len):
     return False
 
 
-@cache
+@memoize()
 def count_possibilities(spring, groups):
     if len(groups) == 0 and "#" not in spring:
         if DEBUG: print("possible", spring, groups)
@@ -1,11 +1,14 @@
-from aocd.models import Puzzle
+from common.grid import Grid
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-puzzle = Puzzle(year=2023, day=13)
+puzzle = LazyPuzzle(year=2023, day=13)
 
 
+@cached_parse
 def parse(input_data):
     data = input_data.split("\n\n")
-    return [example.split("\n") for example in data]
+    return [Grid.from_text(example) for example in data]
 
 
 # Some visual help
@@ -20,12 +23,13 @@ def parse(input_data):
 # 6 #
 
 def find_horizontal_reflection(example, skip=None):
-    for reflection_line in range(len(example) - 1):
+    rows = example.rows()
+    for reflection_line in range(len(rows) - 1):
         match = True
         if reflection_line + 1 == skip:
             continue
-        for col_id in range(0, min(reflection_line + 1, len(example) - reflection_line - 1)):
-            if example[reflection_line - col_id] != example[reflection_line + col_id + 1]:
+        for col_id in range(0, min(reflection_line + 1, len(rows) - reflection_line - 1)):
+            if rows[reflection_line - col_id] != rows[reflection_line + col_id + 1]:
                 match = False
                 break
         if match:
@@ -34,13 +38,7 @@ def find_horizontal_reflection(example, skip=None):
 
 
 def flip(example):
-    def get_column(col_id):
-        return list(map(lambda x: x[col_id], example))
-
-    rows = []
-    for i in range(len(example[0])):
-        rows.append(get_column(i))
-    return rows
+    return example.transposed()
 
 
 def calculate_reflection(example):
@@ -67,12 +65,8 @@ def part1(input_data):
 
 
 def replace(example, y, x, symbol):
-    changes = []
-    for i, row in enumerate(example):
-        if i == y:
-            changes.append(example[i][:x] + symbol + example[i][x + 1:])
-        else:
-            changes.append(example[i])
+    changes = example.copy()
+    changes[y, x] = symbol
     return changes
 
 
@@ -91,12 +85,12 @@ def part2(input_data):
     for example in data:
         (init_ref_hor, init_ref_vert) = calculate_reflection(example)
         found = False
-        for y, row in enumerate(example):
-            for x, symbol in enumerate(row):
+        for y in range(example.height):
+            for x in range(example.width):
                 other_symbol = {
-                    '.': '#',
-                    '#': '.'
-                }.get(symbol)
+                    ord('.'): '#',
+                    ord('#'): '.'
+                }.get(example[y, x])
                 replaced_example = replace(example, y, x, other_symbol)
                 changed_reflection = calculate_reflection_with_forbidden(replaced_example, init_ref_hor, init_ref_vert)
                 if (init_ref_hor, init_ref_vert) != changed_reflection and changed_reflection != (None, None):
@@ -117,9 +111,9 @@ def main():
     puzzle.answer_a = part1(puzzle.input_data)
     print("part1 OK")
 
-    to_replace = ['.#', '#.']
-    assert replace(['.#', '#.'], 1, 1, '#') == ['.#', '##']
-    assert to_replace == ['.#', '#.']
+    to_replace = Grid.from_text(".#\n#.")
+    assert replace(to_replace, 1, 1, '#') == Grid.from_text(".#\n##")
+    assert to_replace == Grid.from_text(".#\n#.")
 
     assert 400 == part2(puzzle.examples[0].input_data)
     print("part2 example OK")
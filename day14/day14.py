@@ -1,41 +1,45 @@
 from enum import Enum
 
-from aocd.models import Puzzle
+from common.grid import Grid
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-puzzle = Puzzle(year=2023, day=14)
+puzzle = LazyPuzzle(year=2023, day=14)
 
+ROCK, EMPTY = b'O.'
 
+
+@cached_parse
 def parse(input_data):
-    return [list(row) for row in input_data.split("\n")]
+    return Grid.from_text(input_data, border='#')  # border stops rolling rocks like a cube rock
 
 
-def find_empty(data, y, x):
-    empty = y
-    for fall_y in reversed(range(0, y)):
-        if data[fall_y][x] == '.':
-            empty = fall_y
-        else:
-            break
-    return empty
+def find_empty(data, i, step):
+    """Index where the rock at i stops when rolling by step."""
+    cells = data.cells
+    while cells[i + step] == EMPTY:
+        i += step
+    return i
 
 
 def calc_load(data):
     load = 0
-    for y, row in enumerate(data):
-        for x, c in enumerate(row):
-            if c == 'O':
-                load += len(data) - y
+    for y in range(data.height):
+        load += data.row(y).tobytes().count(ROCK) * (data.height - y)
     return load
 
 
-def fall_rocks(data):
-    for y, row in enumerate(data):
-        for x, c in enumerate(row):
-            if c == 'O':
-                stop_y = find_empty(data, y, x)
-                if stop_y != y:
-                    data[y][x] = '.'
-                    data[stop_y][x] = 'O'
+def fall_rocks(data, direction=None):
+    """Rolls every rock in place, rocks nearest to the target edge go first. North by default."""
+    step = direction_offset(data, direction or Directions.NORTH)
+    cells = data.cells
+    indices = data.indices() if step < 0 else reversed(list(data.indices()))
+    for i in indices:
+        if cells[i] == ROCK:
+            stop = find_empty(data, i, step)
+            if stop != i:
+                cells[i] = EMPTY
+                cells[stop] = ROCK
     return data
 
 
@@ -64,35 +68,21 @@ class Directions(Enum):
     EAST = 4
 
 
-def rotate_board_right(board):
-    new_board = []
-    for x in range(len(board[0])):
-        new_row = []
-        for y in reversed(range(len(board))):
-            new_row.append(board[y][x])
-        new_board.append(new_row)
-    return new_board
+def direction_offset(board, direction):
+    return {
+        Directions.NORTH: -board.stride,
+        Directions.WEST: -1,
+        Directions.SOUTH: board.stride,
+        Directions.EAST: 1,
+    }.get(direction)
 
 
 def fall_rocks_in_direction(board, direction):
-    rotations = {
-        Directions.NORTH: 0,
-        Directions.WEST: 1,
-        Directions.EAST: 3,
-        Directions.SOUTH: 2,
-    }.get(direction)
-    rotated = board.copy()
-    for _ in range(rotations):
-        rotated = rotate_board_right(rotated)
-    rotated = fall_rocks(rotated)
-    if rotations != 0:
-        for _ in range(4 - rotations):
-            rotated = rotate_board_right(rotated)
-    return rotated
+    return fall_rocks(board, direction)
 
 
 def board_to_str(board):
-    return '\n'.join([''.join(row) for row in board])
+    return str(board)
 
 
 def print_board(board):
@@ -148,7 +138,7 @@ def tortoise_and_hare(seq):
     return cycle_len
 
 
-def part2(input_data, cycle_det_func):
+def part2(input_data, cycle_det_func=tortoise_and_hare):
     board = parse(input_data)
     directions = [Directions.NORTH, Directions.WEST, Directions.SOUTH, Directions.EAST]
     after_cycle_load = []
@@ -169,19 +159,18 @@ def part2(input_data, cycle_det_func):
 
 
 def main():
-    assert find_empty([['.'], ['.'], ['O']], 2, 0) == 0
-    assert find_empty([['#'], ['.'], ['O']], 2, 0) == 1
-    assert find_empty([['#'], ['O'], ['O']], 2, 0) == 2
-    assert find_empty([['O'], ['.'], ['.']], 0, 0) == 0
-    assert calc_load([['.', '#'], ['#', 'O'], ['O', '.']]) == 3
+    for column, start_y, stop_y in [(".\n.\nO", 2, 0), ("#\n.\nO", 2, 1), ("#\nO\nO", 2, 2), ("O\n.\n.", 0, 0)]:
+        grid = parse(column)
+        assert find_empty(grid, grid.index(start_y, 0), -grid.stride) == grid.index(stop_y, 0)
+    assert calc_load(parse(".#\n#O\nO.")) == 3
     assert 136 == part1(puzzle.examples[0].input_data)
     print("part1 example OK")
 
     puzzle.answer_a = part1(puzzle.input_data)
     print("part1 OK")
 
-    assert rotate_board_right([['O'], ['.'], ['.']]) == [['.', '.', 'O']]
-    assert fall_rocks_in_direction([['.', '.', 'O']], Directions.WEST) == [['O', '.', '.']]
+    assert fall_rocks_in_direction(parse("..O"), Directions.WEST) == parse("O..")
+    assert fall_rocks_in_direction(parse("O.\n.."), Directions.SOUTH) == parse("..\nO.")
     cycle_detection_algorith = tortoise_and_hare
     assert 64 == part2(puzzle.examples[0].input_data, cycle_detection_algorith)
     print("part2 example OK")
@@ -1,17 +1,19 @@
 import re
 from collections import OrderedDict
-from functools import cache
 
-from aocd.models import Puzzle
+from common.memo import memoize
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-puzzle = Puzzle(year=2023, day=15)
+puzzle = LazyPuzzle(year=2023, day=15)
 
 
+@cached_parse
 def parse(input_data):
     return input_data.split(",")
 
 
-@cache
+@memoize()
 def holiday_hash(string):
     value = 0
     for char in string:
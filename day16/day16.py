@@ -1,13 +1,16 @@
 from enum import Enum
-from typing import Set, Tuple
+from typing import Tuple
 
-from aocd.models import Puzzle
+from common.grid import Grid
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-puzzle = Puzzle(year=2023, day=16)
+puzzle = LazyPuzzle(year=2023, day=16)
 
 
+@cached_parse
 def parse(input_data):
-    return input_data.split("\n")
+    return Grid.from_text(input_data)  # zero border ends beams leaving the board
 
 
 class Dir(Enum):
@@ -17,72 +20,48 @@ class Dir(Enum):
     RIGHT = 4
 
 
-def print_beams(board, visited: Set[Tuple[int, int, Dir]]):
-    result = []
-    for row in board:
-        result.append(list(row))
-    for py, px, d in visited:
-        char = {
-            Dir.UP: "^",
-            Dir.DOWN: "v",
-            Dir.LEFT: "<",
-            Dir.RIGHT: ">",
-        }.get(d)
-        if result[py][px] == '.':
-            result[py][px] = char
+# beams go in directions numbered like Grid.neighbours4 offsets: up, right, down, left
+DIRECTION_IDS = {Dir.UP: 0, Dir.RIGHT: 1, Dir.DOWN: 2, Dir.LEFT: 3}
+
+# new directions of a beam entering a tile, by tile byte and direction id
+BEAMS = [None] * 256
+BEAMS[ord('.')] = ((0,), (1,), (2,), (3,))
+BEAMS[ord('/')] = ((1,), (0,), (3,), (2,))
+BEAMS[ord('\\')] = ((3,), (2,), (1,), (0,))
+BEAMS[ord('|')] = ((0,), (0, 2), (2,), (0, 2))
+BEAMS[ord('-')] = ((1, 3), (1,), (1, 3), (3,))
+
+
+def print_beams(board, visited):
+    """visited holds a bit per direction id for every cell."""
+    result = [list(row.decode()) for row in board.rows()]
+    for i in board.indices():
+        if visited[i]:
+            py, px = board.position(i)
+            if result[py][px] == '.':
+                result[py][px] = "^>v<"[visited[i].bit_length() - 1]
     print('\n'.join([''.join(row) for row in result]), end="\n\n")
 
 
 def simulate_beam(board, start_beam: Tuple[int, int, Dir]):
-    queue = {start_beam}
-    visited = set()
+    pos_y, pos_x, direction = start_beam
+    cells = board.cells
+    offsets = board.neighbours4
+    visited = bytearray(len(cells))
+    queue = [(board.index(pos_y, pos_x), DIRECTION_IDS[direction])]
     while len(queue) != 0:
-        pos_y, pos_x, direction = queue.pop()
-        if (pos_y, pos_x, direction) in visited:
+        position, direction = queue.pop()
+        if visited[position] >> direction & 1:
             continue
-        visited.add((pos_y, pos_x, direction))
-        new_pos_y, new_pos_x = {
-            Dir.UP: (pos_y - 1, pos_x),
-            Dir.DOWN: (pos_y + 1, pos_x),
-            Dir.RIGHT: (pos_y, pos_x + 1),
-            Dir.LEFT: (pos_y, pos_x - 1)
-        }.get(direction)
-        if not (0 <= new_pos_y < len(board) and 0 <= new_pos_x < len(board[0])):
+        visited[position] |= 1 << direction
+        new_position = position + offsets[direction]
+        mirror = cells[new_position]
+        if mirror == board.border:
             continue
-        mirror = board[new_pos_y][new_pos_x]
-        if mirror == ".":
-            queue.add((new_pos_y, new_pos_x, direction))
-        elif mirror == "/":
-            new_direction = {
-                Dir.UP: Dir.RIGHT,
-                Dir.DOWN: Dir.LEFT,
-                Dir.LEFT: Dir.DOWN,
-                Dir.RIGHT: Dir.UP
-            }.get(direction)
-            queue.add((new_pos_y, new_pos_x, new_direction))
-        elif mirror == "\\":
-            new_direction = {
-                Dir.UP: Dir.LEFT,
-                Dir.DOWN: Dir.RIGHT,
-                Dir.LEFT: Dir.UP,
-                Dir.RIGHT: Dir.DOWN
-            }.get(direction)
-            queue.add((new_pos_y, new_pos_x, new_direction))
-        elif mirror == "|":
-            if direction == Dir.UP or direction == Dir.DOWN:
-                queue.add((new_pos_y, new_pos_x, direction))
-            else:
-                queue.add((new_pos_y, new_pos_x, Dir.UP))
-                queue.add((new_pos_y, new_pos_x, Dir.DOWN))
-        elif mirror == "-":
-            if direction == Dir.LEFT or direction == Dir.RIGHT:
-                queue.add((new_pos_y, new_pos_x, direction))
-            else:
-                queue.add((new_pos_y, new_pos_x, Dir.LEFT))
-                queue.add((new_pos_y, new_pos_x, Dir.RIGHT))
-        # print_beams(data, visited)
-    lighted = set(map(lambda beam: (beam[0], beam[1]), visited))
-    return len(lighted) - 1  # remove starting beam
+        for new_direction in BEAMS[mirror][direction]:
+            queue.append((new_position, new_direction))
+        # print_beams(board, visited)
+    return len(visited) - visited.count(0) - 1  # remove starting beam
 
 
 def part1(input_data):
@@ -94,13 +73,13 @@ def part1(input_data):
 def part2(input_data):
     data = parse(input_data)
     max_light = 0
-    for y in range(len(data)):
+    for y in range(data.height):
         left = simulate_beam(data, (y, -1, Dir.RIGHT))
         right = simulate_beam(data, (y, -1, Dir.LEFT))
         max_light = max(max_light, left, right)
-    for x in range(len(data[0])):
+    for x in range(data.width):
         top = simulate_beam(data, (-1, x, Dir.DOWN))
-        bot = simulate_beam(data, (len(data), x, Dir.UP))
+        bot = simulate_beam(data, (data.height, x, Dir.UP))
         max_light = max(max_light, top, bot)
     return max_light
 
@@ -1,107 +1,69 @@
-from enum import Enum
-from heapq import heappush, heappop
+from common.graph import BucketQueue
+from common.grid import Grid
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-from aocd.models import Puzzle
+puzzle = LazyPuzzle(year=2023, day=17)
 
-puzzle = Puzzle(year=2023, day=17)
+# digits to their heat loss, the zero border marks cells outside the city
+DIGIT_VALUES = bytes.maketrans(b'0123456789', bytes(range(10)))
 
 
+@cached_parse
 def parse(input_data):
-    return [list(map(int, line)) for line in input_data.split("\n")]
+    board = Grid.from_text(input_data)
+    board.cells = board.cells.translate(DIGIT_VALUES)
+    return board
 
 
-class Dir(Enum):
-    UP = 1
-    DOWN = 2
-    LEFT = 3
-    RIGHT = 4
-
-    def __lt__(self, other):
-        return self.value < other.value
+# directions are numbered like Grid.neighbours4 offsets
+UP, RIGHT, DOWN, LEFT = range(4)
 
 
 def turn_left(direction):
-    return {
-        Dir.UP: Dir.LEFT,
-        Dir.RIGHT: Dir.UP,
-        Dir.DOWN: Dir.RIGHT,
-        Dir.LEFT: Dir.DOWN
-    }.get(direction)
+    return (direction - 1) % 4
 
 
 def turn_right(direction):
-    return {
-        Dir.UP: Dir.RIGHT,
-        Dir.RIGHT: Dir.DOWN,
-        Dir.DOWN: Dir.LEFT,
-        Dir.LEFT: Dir.UP
-    }.get(direction)
-
-
-def get_delta(direction):
-    return {
-        Dir.UP: (-1, 0),
-        Dir.RIGHT: (0, 1),
-        Dir.DOWN: (1, 0),
-        Dir.LEFT: (0, -1)
-    }.get(direction)
-
-
-def in_bounds(board, y, x):
-    return 0 <= y < len(board) and 0 <= x < len(board[0])
-
-
-def print_board_with_path(board, prev):
-    with_path = [[x for x in line] for line in board]
-    y = len(board) - 1
-    x = len(board[0]) - 1
-    while not (y == 0 and x == 0):
-        prev_y, prev_x, direction = prev[y][x]
-        dir_symb = {
-            Dir.UP: '^',
-            Dir.DOWN: 'v',
-            Dir.RIGHT: '>',
-            Dir.LEFT: '<',
-        }.get(direction)
-        with_path[y][x] = dir_symb
-        y, x, = prev_y, prev_x
-    print('path')
-    print('\n'.join([','.join([str(x).rjust(4) for x in line]) for line in with_path]))
+    return (direction + 1) % 4
+
+
+def state_id(position, straight, direction):
+    """Search state packed in one int, straight is -1..10."""
+    return (position << 6) | ((straight + 1) << 2) | direction
 
 
 def find_path(board):
-    queue = []
-    # cost, y, x, straight, dir, prev_y, prev_x, prev_dir
-    heappush(queue, (0, 0, 0, 4, Dir.RIGHT, -1, -1))  # 4 because first 4 moves can be in right
-    visited = set()
+    cells = board.cells
+    offsets = board.neighbours4
+    exit_index = board.index(board.height - 1, board.width - 1)
+    queue = BucketQueue()  # costs only grow by a digit, so buckets beat a heap
+    # cost, state of position, straight, dir
+    queue.push(0, state_id(board.index(0, 0), 4, RIGHT))  # 4 because first 4 moves can be in right
+    visited = bytearray(len(cells) << 6)
     lowest_cost = float('inf')
     while len(queue) != 0:
-        cost, y, x, straight, direction, prev_y, prev_x = heappop(queue)
-        if (y, x, straight, direction) in visited:
+        cost, state = queue.pop()
+        if visited[state]:
             continue
-        visited.add((y, x, straight, direction))
+        visited[state] = 1
+        position, straight, direction = state >> 6, ((state >> 2) & 15) - 1, state & 3
         # left
         new_dir = turn_left(direction)
-        dy, dx = get_delta(new_dir)
-        new_y, new_x = y + dy, x + dx
-        if in_bounds(board, new_y, new_x):
-            new_cost = cost + board[new_y][new_x]
-            heappush(queue, (new_cost, new_y, new_x, 3, new_dir, y, x))
+        new_position = position + offsets[new_dir]
+        if cells[new_position]:
+            queue.push(cost + cells[new_position], state_id(new_position, 3, new_dir))
         # right
         new_dir = turn_right(direction)
-        dy, dx = get_delta(new_dir)
-        new_y, new_x = y + dy, x + dx
-        if in_bounds(board, new_y, new_x):
-            new_cost = cost + board[new_y][new_x]
-            heappush(queue, (new_cost, new_y, new_x, 3, new_dir, y, x))
+        new_position = position + offsets[new_dir]
+        if cells[new_position]:
+            queue.push(cost + cells[new_position], state_id(new_position, 3, new_dir))
         # straight
         if straight > 1:
-            dy, dx = get_delta(direction)
-            new_y, new_x = y + dy, x + dx
-            if in_bounds(board, new_y, new_x):
-                new_cost = cost + board[new_y][new_x]
-                heappush(queue, (new_cost, new_y, new_x, straight - 1, direction, y, x))
-        if y == len(board) - 1 and x == len(board[0]) - 1:
+            new_position = position + offsets[direction]
+            if cells[new_position]:
+                queue.push(cost + cells[new_position], state_id(new_position, straight - 1, direction))
+        if position == exit_index:
             lowest_cost = cost
             break
     return lowest_cost
@@ -114,42 +76,40 @@ def part1(input_data):
 
 
 def find_ultra_path(board):
-    queue = []
-    # cost, y, x, straight, dir, prev_y, prev_x, prev_dir
-    heappush(queue, (0, 0, 0, -1, Dir.RIGHT, -1, -1))
-    visited = set()
+    cells = board.cells
+    offsets = board.neighbours4
+    exit_index = board.index(board.height - 1, board.width - 1)
+    queue = BucketQueue()
+    # cost, state of position, straight, dir
+    queue.push(0, state_id(board.index(0, 0), -1, RIGHT))
+    visited = bytearray(len(cells) << 6)
     lowest_cost = float('inf')
     min_moves = 3  # one less
     max_moves = 9  # one less
     while len(queue) != 0:
-        cost, y, x, straight, direction, prev_y, prev_x = heappop(queue)
-        if (y, x, straight, direction) in visited:
+        cost, state = queue.pop()
+        if visited[state]:
             continue
-        visited.add((y, x, straight, direction))
+        visited[state] = 1
+        position, straight, direction = state >> 6, ((state >> 2) & 15) - 1, state & 3
         # left
         if straight >= min_moves:
             new_dir = turn_left(direction)
-            dy, dx = get_delta(new_dir)
-            new_y, new_x = y + dy, x + dx
-            if in_bounds(board, new_y, new_x):
-                new_cost = cost + board[new_y][new_x]
-                heappush(queue, (new_cost, new_y, new_x, 0, new_dir, y, x))
+            new_position = position + offsets[new_dir]
+            if cells[new_position]:
+                queue.push(cost + cells[new_position], state_id(new_position, 0, new_dir))
         # right
         if straight >= min_moves:
             new_dir = turn_right(direction)
-            dy, dx = get_delta(new_dir)
-            new_y, new_x = y + dy, x + dx
-            if in_bounds(board, new_y, new_x):
-                new_cost = cost + board[new_y][new_x]
-                heappush(queue, (new_cost, new_y, new_x, 0, new_dir, y, x))
+            new_position = position + offsets[new_dir]
+            if cells[new_position]:
+                queue.push(cost + cells[new_position], state_id(new_position, 0, new_dir))
         # straight
         if straight < max_moves:
-            dy, dx = get_delta(direction)
-            new_y, new_x = y + dy, x + dx
-            if in_bounds(board, new_y, new_x):
-                new_cost = cost + board[new_y][new_x]
-                heappush(queue, (new_cost, new_y, new_x, straight + 1, direction, y, x))
-        if y == len(board) - 1 and x == len(board[0]) - 1 and straight >= min_moves:
+            new_position = position + offsets[direction]
+            if cells[new_position]:
+                queue.push(cost + cells[new_position], state_id(new_position, straight + 1, direction))
+        if position == exit_index and straight >= min_moves:
             lowest_cost = cost
             break
     return lowest_cost
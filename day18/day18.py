@@ -1,11 +1,14 @@
-from aocd.models import Puzzle
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
+from common.reader import lines
 
-puzzle = Puzzle(year=2023, day=18)
+puzzle = LazyPuzzle(year=2023, day=18)
 
 
+@cached_parse
 def parse(input_data):
     result = []
-    for line in input_data.split("\n"):
+    for line in lines(input_data):
         direction, length, color = line.split(" ")
         length = int(length)
         color = color[1:-1]
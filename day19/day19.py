@@ -1,12 +1,12 @@
-import math
-import re
-from math import isnan
+from common.intervals import Box, Interval
+from common.ints import scan_ints
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-from aocd.models import Puzzle
-
-puzzle = Puzzle(year=2023, day=19)
+puzzle = LazyPuzzle(year=2023, day=19)
 
 
+@cached_parse
 def parse(input_data):
     # Sample: px{a<2006:qkq,m>2090:A,rfg}
     workflows, items = input_data.split("\n\n")
@@ -25,15 +25,14 @@ def parse(input_data):
             else:
                 result_rules.append((None, None, None, rule))
         result_workflows[name] = result_rules
-    items = items.split("\n")
     result_items = []
-    for item in items:
-        group = re.search(r"{x=(?P<x>([0-9]+)),m=(?P<m>([0-9]+)),a=(?P<a>([0-9]+)),s=(?P<s>([0-9]+))}", item)
+    values, _ = scan_ints(items)
+    for x, m, a, s in zip(*[iter(values)] * 4):  # Sample: {x=787,m=2655,a=1222,s=2876}
         result_items.append({
-            'x': int(group['x']),
-            'm': int(group['m']),
-            'a': int(group['a']),
-            's': int(group['s']),
+            'x': x,
+            'm': m,
+            'a': a,
+            's': s,
         })
     return result_workflows, result_items
 
@@ -69,62 +68,23 @@ def part1(input_data):
     return result_sum
 
 
-class Range:
-    def __init__(self, start=-float('inf'), end=float('inf')):
-        self.start = start
-        self.end = end
-
-    def __add__(self, other):
-        if self._overlap(other):
-            return Range(max(self.start, other.start), min(self.end, other.end))
-        else:
-            return Range.empty()
-
-    def _overlap(self, other):
-        return self.end >= other.start and self.start <= other.end
-
-    def __repr__(self):
-        return f'({self.start}; {self.end})'
-
-    def __copy__(self):
-        return Range(self.start, self.end)
-
-    def invert(self):
-        if math.isinf(self.start):
-            return Range(self.end + 1, float('inf'))
-        if math.isinf(self.end):
-            return Range(-float('inf'), self.start - 1)
-
-    def is_empty(self):
-        return isnan(self.start)
+CATEGORIES = 'xmas'
 
-    def __len__(self):
-        return self.end - self.start + 1
 
-    def __eq__(self, other):
-        return self.start == other.start and self.end == other.end
-
-    @staticmethod
-    def from_rule(op, value):
-        if op is None:
-            return Range.full()  # full range
-        if op == '>':
-            return Range(start=value + 1)
-        else:
-            return Range(end=value - 1)
-
-    @staticmethod
-    def empty():
-        return Range(float('nan'), float('nan'))
-
-    @staticmethod
-    def full():
-        return Range(-float('inf'), float('inf'))
+def split_by_rule(box, attr, op, value):
+    """Parts of the box which pass and fail the rule's condition."""
+    axis = CATEGORIES.index(attr)
+    if op == '>':
+        below, above = box.split(axis, value + 1)
+        return above, below
+    else:
+        below, above = box.split(axis, value)
+        return below, above
 
 
 def convert_to_graph(workflows):
     queue = [('in', 0)]
-    graph = {}  # (workflow, # of rule in workflow) : (category, left range, left node, right range, right node)
+    graph = {}  # (workflow, # of rule in workflow) : (rule, passing node, failing node)
     visited = {('A', 0), ('R', 0)}
     while len(queue) > 0:
         name, node_id = queue.pop(0)
@@ -133,11 +93,9 @@ def convert_to_graph(workflows):
         visited.add((name, node_id))
         attr, op, value, next_name = workflows[name][node_id]
         if attr is None:
-            graph[(name, node_id)] = (None, Range.empty(), (next_name, 0), Range.empty(), None)
+            graph[(name, node_id)] = (None, (next_name, 0), None)
         else:
-            rule = Range.from_rule(op, value)
-            graph[(name, node_id)] = (attr, rule, (next_name, 0),
-                                      rule.invert(), (name, node_id + 1))
+            graph[(name, node_id)] = ((attr, op, value), (next_name, 0), (name, node_id + 1))
 
         if attr is not None:
             queue.append((name, node_id + 1))
@@ -148,44 +106,32 @@ def convert_to_graph(workflows):
 def part2(input_data):
     workflows, _ = parse(input_data)
     graph = convert_to_graph(workflows)
-    xmas = {
-        x: Range(1, 4000) for x in 'xmas'
-    }
+    xmas = Box(*(Interval.closed(1, 4000) for _ in CATEGORIES))
     visited = {('A', 0), ('R', 0)}
-    possible_ranges = []
+    result = 0
 
-    def dfs(node, xmas_range):
+    def dfs(node, xmas_box):
+        nonlocal result
         node_name, _ = node
         if node_name == 'A':
-            possible_ranges.append(xmas_range)
+            result += xmas_box.volume
             return
         if node in visited:
             return
         visited.add(node)
-        attr, left_range, left_node, right_range, right_node = graph[node]
-
-        if attr is not None:
-            # in range
-            new_ranges = xmas_range.copy()
-            new_ranges[attr] = xmas_range[attr] + left_range
-            if all([not r.is_empty() for r in new_ranges.values()]):
-                dfs(left_node, new_ranges)
-            # out of range
-            new_ranges = xmas_range.copy()
-            new_ranges[attr] = xmas_range[attr] + right_range
-            if all([not r.is_empty() for r in new_ranges.values()]):
-                dfs(right_node, new_ranges)
+        rule, passing_node, failing_node = graph[node]
+
+        if rule is not None:
+            passing, failing = split_by_rule(xmas_box, *rule)
+            if passing:
+                dfs(passing_node, passing)
+            if failing:
+                dfs(failing_node, failing)
         else:  # next node without rule
-            dfs(left_node, xmas_range)
+            dfs(passing_node, xmas_box)
         visited.remove(node)
 
     dfs(('in', 0), xmas)
-    result = 0
-    for possible in possible_ranges:
-        current_possible = 1
-        for possible_range in possible.values():
-            current_possible *= len(possible_range)
-        result += current_possible
     return result
 
 
@@ -196,10 +142,12 @@ def main():
     puzzle.answer_a = part1(puzzle.input_data)
     print("part1 OK")
 
-    assert Range(1, 5) + Range(3, 10) == Range(3, 5)
-    assert Range(-float('inf'), 5).invert() == Range(6, float('inf'))
-    assert Range(6, float('inf')).invert() == Range(-float('inf'), 5)
-    assert Range(1, 2).__len__() == 2
+    assert Interval.closed(1, 5) & Interval.closed(3, 10) == Interval.closed(3, 5)
+    assert split_by_rule(Box(Interval.closed(1, 4000)), 'x', '<', 6) == (Box(Interval.closed(1, 5)),
+                                                                         Box(Interval.closed(6, 4000)))
+    assert split_by_rule(Box(Interval.closed(1, 4000)), 'x', '>', 5) == (Box(Interval.closed(6, 4000)),
+                                                                         Box(Interval.closed(1, 5)))
+    assert len(Interval.closed(1, 2)) == 2
 
     assert 167409079868000 == part2(puzzle.examples[0].input_data)
     print("part2 example OK")
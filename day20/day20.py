@@ -1,107 +1,16 @@
-import abc
 from collections import defaultdict, deque
-from enum import Enum
 from math import lcm
 
-from aocd.models import Puzzle
+from common.graph import Graph
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-puzzle = Puzzle(year=2023, day=20)
+puzzle = LazyPuzzle(year=2023, day=20)
 
-
-class State(Enum):
-    LOW = 1
-    HIGH = 2
-
-
-PULSES_QUEUE = deque()
-
-
-class Node(abc.ABC):
-    def __init__(self, name):
-        self.outputs = []
-        self.inputs = []
-        self.name = name
-
-    def add_input(self, node):
-        self.inputs.append(node)
-
-    def add_output(self, node):
-        self.outputs.append(node)
-
-    @abc.abstractmethod
-    def recv_pulse(self, sender_name, state):
-        pass
-
-    def send_pulse(self, state):
-        for node in self.outputs:
-            PULSES_QUEUE.append((self.name, state, node.name))
-
-
-class BroadcastNode(Node):
-    def __init__(self, name):
-        super().__init__(name)
-        self.outputs = []
-
-    def recv_pulse(self, _, state):
-        self.send_pulse(state)
-
-    def __repr__(self):
-        return f"{self.name} -> {','.join(map(lambda n: n.name, self.outputs))}"
-
-
-class Conjunction(Node):
-
-    def __init__(self, name):
-        super().__init__(name)
-        self.last_state = {}
-
-    def add_input(self, node):
-        super().add_input(node)
-        self.last_state[node.name] = State.LOW
-
-    def recv_pulse(self, sender_name, state):
-        self.last_state[sender_name] = state
-        if all(map(lambda x: x == State.HIGH, self.last_state.values())):
-            self.send_pulse(State.LOW)
-        else:
-            self.send_pulse(State.HIGH)
-
-    def __repr__(self):
-        return f"&{self.name} -> {','.join(map(lambda n: n.name, self.outputs))}"
-
-
-class FlipFlop(Node):
-    OFF = 1
-    ON = 2
-
-    def __init__(self, name):
-        super().__init__(name)
-        self.state = FlipFlop.OFF
-
-    def recv_pulse(self, sender_name, state):
-        if state == State.HIGH:
-            return
-        if self.state == FlipFlop.ON:
-            self.state = FlipFlop.OFF
-            self.send_pulse(State.LOW)
-        else:
-            self.state = FlipFlop.ON
-            self.send_pulse(State.HIGH)
-
-    def __repr__(self):
-        return f"%{self.name} -> {','.join(map(lambda n: n.name, self.outputs))}"
-
-
-class TestNode(Node):
-    def __init__(self, name):
-        super().__init__(name)
-        self.received = False
-
-    def recv_pulse(self, sender_name, state):
-        if state == State.LOW:
-            self.received = True
+LOW, HIGH = 0, 1
 
 
+@cached_parse
 def parse(input_data):
     graph = defaultdict(list)
     types = {}
@@ -122,63 +31,86 @@ def parse(input_data):
     return graph, types
 
 
-def connect_nodes(graph, types):
-    nodes = {}
-    for name, outputs in graph.items():
-        node_type = types[name]
-        if node_type == 'b':
-            nodes[name] = BroadcastNode(name)
-        elif node_type == '&':
-            nodes[name] = Conjunction(name)
-        elif node_type == '%':
-            nodes[name] = FlipFlop(name)
-        elif node_type is None:
-            nodes[name] = TestNode(name)
-
-    for name, outputs in graph.items():
-        for output in outputs:
-            nodes[name].add_output(nodes[output])
-            nodes[output].add_input(nodes[name])
-    return nodes
+class Network:
+    """
+    Modules as graph nodes and their wires as edges. A pulse on the queue is its edge and
+    level packed in one int, conjunctions remember the last level of every input edge.
+    """
+
+    def __init__(self, graph, types):
+        self.graph = Graph.from_adjacency(graph)
+        names = self.graph.labels.names
+        self.types = [types[name] for name in names]
+        self.sources = [node for node in range(len(names)) for _ in self.graph.edge_range(node)]
+        self.inputs = [0] * len(names)
+        for target in self.graph.targets:
+            self.inputs[target] += 1
+        self.flip_flops_on = bytearray(len(names))
+        self.last_levels = bytearray(len(self.graph.targets))
+        self.high_inputs = [0] * len(names)
+
+    def press_button(self, watched=-1):
+        """
+        Sends one low pulse to the broadcaster and processes pulses until the queue is empty.
+        Returns counts of low and high pulses and nodes which sent a high pulse to watched.
+        """
+        offsets, targets = self.graph.offsets, self.graph.targets
+        types, sources = self.types, self.sources
+        flip_flops_on, last_levels, high_inputs, inputs = (self.flip_flops_on, self.last_levels, self.high_inputs,
+                                                           self.inputs)
+        broadcaster = self.graph.labels['broadcaster']
+        pulses = [1, 0]  # the button's pulse
+        high_senders = []
+        queue = deque(edge << 1 | LOW for edge in range(offsets[broadcaster], offsets[broadcaster + 1]))
+        while queue:
+            pulse = queue.popleft()
+            edge, level = pulse >> 1, pulse & 1
+            pulses[level] += 1
+            node = targets[edge]
+            if level == HIGH and node == watched:
+                high_senders.append(sources[edge])
+            node_type = types[node]
+            if node_type == '%':
+                if level == HIGH:
+                    continue
+                flip_flops_on[node] ^= 1
+                level = flip_flops_on[node]
+            elif node_type == '&':
+                if last_levels[edge] != level:
+                    last_levels[edge] = level
+                    high_inputs[node] += 1 if level == HIGH else -1
+                level = LOW if high_inputs[node] == inputs[node] else HIGH
+            elif node_type != 'b':
+                continue
+            for next_edge in range(offsets[node], offsets[node + 1]):
+                queue.append(next_edge << 1 | level)
+        return pulses[LOW], pulses[HIGH], high_senders
 
 
 def part1(input_data):
     graph, types = parse(input_data)
-    nodes = connect_nodes(graph, types)
-    pulses = defaultdict(int)
+    network = Network(graph, types)
+    low, high = 0, 0
     for i in range(1000):
-        PULSES_QUEUE.append(('button', State.LOW, 'broadcaster'))
-        while len(PULSES_QUEUE) > 0:
-            sender_name, state, recv_name = PULSES_QUEUE.popleft()
-            nodes[recv_name].recv_pulse(sender_name, state)
-            # print(f"{sender_name} -{state}-> {recv_name}")
-            pulses[state] += 1
-    return pulses[State.HIGH] * pulses[State.LOW]
+        pulses_low, pulses_high, _ = network.press_button()
+        low += pulses_low
+        high += pulses_high
+    return high * low
 
 
 def part2(input_data):
     graph, types = parse(input_data)
-    nodes = connect_nodes(graph, types)
-    test_node: TestNode = nodes['rx']
-    test_parent = test_node.inputs[0]
-    cycles = {node.name: 0 for node in test_parent.inputs}
-
-    def simulate():
-        button_counter = 0
-        while True:
-            button_counter += 1
-            PULSES_QUEUE.append(('button', State.LOW, 'broadcaster'))
-            while len(PULSES_QUEUE) > 0:
-                sender_name, state, recv_name = PULSES_QUEUE.popleft()
-                nodes[recv_name].recv_pulse(sender_name, state)
-                # print(f"{sender_name} -{state}-> {recv_name}")
-                if state == State.HIGH and recv_name == test_parent.name:
-                    if cycles[sender_name] == 0:
-                        cycles[sender_name] = button_counter
-                    if all(x > 0 for x in cycles.values()):
-                        return
-
-    simulate()
+    network = Network(graph, types)
+    test_node = network.graph.labels['rx']
+    test_parent = network.sources[network.graph.targets.index(test_node)]
+    cycles = {network.sources[edge]: 0 for edge, target in enumerate(network.graph.targets) if target == test_parent}
+    button_counter = 0
+    while not all(x > 0 for x in cycles.values()):
+        button_counter += 1
+        _, _, high_senders = network.press_button(watched=test_parent)
+        for sender in high_senders:
+            if cycles[sender] == 0:
+                cycles[sender] = button_counter
     return lcm(*cycles.values())
 
 
@@ -1,23 +1,26 @@
-from functools import cache
+from functools import lru_cache
 from typing import Tuple, List
 
-from aocd.models import Puzzle
+from common.graph import Graph, bfs
+from common.grid import Grid
+from common.memo import memoize
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-from day17.day17 import in_bounds
+puzzle = LazyPuzzle(year=2023, day=21)
 
-puzzle = Puzzle(year=2023, day=21)
 
+ROCK = ord('#')
 
+
+@cached_parse
 def parse(input_data):
-    return tuple(tuple(row) for row in input_data.split("\n"))
+    return Grid.from_text(input_data, border='#')  # rocks around the garden stop walks at the edge
 
 
 def start_pos(board):
-    for y, row in enumerate(board):
-        for x, c in enumerate(row):
-            if c == 'S':
-                return y, x
-    return None
+    start = board.find('S')
+    return board.position(start) if start != -1 else None
 
 
 neighbours = [
@@ -28,40 +31,49 @@ neighbours = [
 ]
 
 
-@cache
+@lru_cache(maxsize=4)
+def garden_graph(board):
+    return Graph.from_grid(board, lambda cell: cell != ROCK)
+
+
+@lru_cache(maxsize=64)
+def distances_from(sy, sx, board):
+    return bfs(garden_graph(board), board.index(sy, sx))
+
+
+@memoize()
 def simulate_from_point(sy, sx, board, max_steps, print_result=False):
-    queue = {(sy, sx)}
-    next_queue = set()
-    for i in range(max_steps):
-        for y, x in queue:
-            for dy, dx in neighbours:
-                ny, nx = y + dy, x + dx
-                if in_bounds(board, ny, nx) and board[ny][nx] != '#':
-                    next_queue.add((ny, nx))
-        queue = next_queue
-        next_queue = set()
+    """
+    Plots reachable in exactly max_steps. Stepping back and forth wastes two steps, so those are
+    the plots at most max_steps away with the same parity, unless the start is walled in.
+    """
+    graph = garden_graph(board)
+    start = board.index(sy, sx)
+    if max_steps > 0 and graph.degree(start) == 0:
+        return 0
+    parity = max_steps % 2
+    queue = [position for position, distance in enumerate(distances_from(sy, sx, board))
+             if 0 <= distance <= max_steps and distance % 2 == parity]
     if print_result:
-        print_board(list(queue), board)
+        print_board([board.position(position) for position in queue], board)
     return len(queue)
 
 
-def part1(input_data, max_steps, debug=False):
+def part1(input_data, steps=64, debug=False):
     board = parse(input_data)
     sy, sx = start_pos(board)
-    return simulate_from_point(sy, sx, board, max_steps, print_result=debug)
+    return simulate_from_point(sy, sx, board, steps, print_result=debug)
 
 
 def get_infinite_board(y, x, board):
-    if not in_bounds(board, y, x):
-        pass
-    return board[y % len(board)][x % len(board[0])]
+    return board[y % board.height, x % board.width]
 
 
 def print_board(queue: List[Tuple[int, int]], board):
     new_board = []
-    for row in board:
+    for row in board.rows():
         new_row = []
-        for cell in row:
+        for cell in row.decode():
             new_row.append(cell)
         new_board.append(new_row)
 
@@ -72,17 +84,17 @@ def print_board(queue: List[Tuple[int, int]], board):
         print(''.join(row))
 
 
-def part2_naive(input_data, max_steps):
+def part2_naive(input_data, steps):
     board = parse(input_data)
     sy, sx = start_pos(board)
     queue = {(sy, sx)}
     next_queue = set()
 
-    for i in range(max_steps):
+    for i in range(steps):
         for y, x in queue:
             for dy, dx in neighbours:
                 ny, nx = y + dy, x + dx
-                if get_infinite_board(ny, nx, board) != '#':
+                if get_infinite_board(ny, nx, board) != ROCK:
                     next_queue.add((ny, nx))
         queue = next_queue
         next_queue = set()
@@ -90,9 +102,9 @@ def part2_naive(input_data, max_steps):
     return len(queue)
 
 
-def part2(input_data, steps):
+def part2(input_data, steps=26501365):
     board = parse(input_data)
-    size = len(board)
+    size = board.height
     n = (steps - size // 2) // size
     top_mid = simulate_from_point(size - 1, size // 2, board, size - 1)
     left_mid = simulate_from_point(size // 2, size - 1, board, size - 1)
@@ -140,7 +152,7 @@ def main():
     assert 16 == part1(puzzle.examples[0].input_data, 6, debug=True)
     print("part1 example OK")
 
-    puzzle.answer_a = part1(puzzle.input_data, 64)
+    puzzle.answer_a = part1(puzzle.input_data)
     print("part1 OK")
 
     assert 16 == part2_naive(puzzle.examples[0].input_data, 6)
@@ -168,7 +180,7 @@ def main():
     assert part2_naive(puzzle.input_data, steps) == part2(puzzle.input_data, steps)
     print("Example with n=2 OK")
 
-    puzzle.answer_b = part2(puzzle.input_data, 26501365)
+    puzzle.answer_b = part2(puzzle.input_data)
     print("part2 OK")
 
 
@@ -1,10 +1,11 @@
-import re
 from collections import deque
 
-from aocd.models import Puzzle
-from tqdm import tqdm
+from common.ints import scan_ints
+from common.intervals import Box, Interval
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-puzzle = Puzzle(year=2023, day=22)
+puzzle = LazyPuzzle(year=2023, day=22)
 
 
 class Cube:
@@ -15,9 +16,8 @@ class Cube:
         assert self.sy <= self.ey
         assert self.sz <= self.ez
         self.id = cube_id
-
-    def get_ranges(self):
-        return [(self.sz, self.ez), (self.sy, self.ey), (self.sx, self.ex)]  # start from z
+        self.box = Box(Interval.closed(self.sz, self.ez), Interval.closed(self.sy, self.ey),
+                       Interval.closed(self.sx, self.ex))  # start from z
 
     def fall(self, cubes):
         cube = self
@@ -38,10 +38,7 @@ class Cube:
         return True
 
     def collide(self, other: 'Cube') -> bool:
-        for cube_range, other_range in zip(self.get_ranges(), other.get_ranges()):
-            if not Cube._overlap(cube_range, other_range):
-                return False
-        return True
+        return self.box.overlaps(other.box)
 
     def fall_by_one(self):
         return Cube(self.id, (self.sx, self.sy, self.sz - 1), (self.ex, self.ey, self.ez - 1))
@@ -77,19 +74,13 @@ class Cube:
     def __lt__(self, other):
         return self.sz < other.sz
 
-    @staticmethod
-    def _overlap(lhs, rhs):
-        lhs_start, lhs_end = lhs
-        rhs_start, rhs_end = rhs
-        return lhs_end >= rhs_start and lhs_start <= rhs_end
-
 
+@cached_parse
 def parse(input_data):
     cubes = []
-    for idx, line in enumerate(input_data.split("\n")):
-        groups = re.search(r"(?P<sx>(\d+)),(?P<sy>(\d+)),(?P<sz>(\d+))~(?P<ex>(\d+)),(?P<ey>(\d+)),(?P<ez>(\d+))", line)
-        sx, sy, sz, ex, ey, ez = (int(groups['sx']), int(groups['sy']), int(groups['sz']),
-                                  int(groups['ex']), int(groups['ey']), int(groups['ez']))
+    values, _ = scan_ints(input_data)
+    # every line has the six coordinates of a brick's two ends
+    for idx, (sx, sy, sz, ex, ey, ez) in enumerate(zip(*[iter(values)] * 6)):
         cubes.append(Cube(idx, (sx, sy, sz), (ex, ey, ez)))
     return cubes
 
@@ -132,6 +123,8 @@ def are_stable(cubes, min_z=1):
 
 
 def simulate_until_stable(cubes, min_z=1):
+    from tqdm import tqdm
+
     while not are_stable(cubes, min_z):
         cubes = sorted(cubes)
         for i in tqdm(range(len(cubes))):
@@ -143,6 +136,8 @@ def simulate_until_stable(cubes, min_z=1):
 
 
 def part1(input_data, debug=False):
+    from tqdm import tqdm
+
     cubes = parse(input_data)
     if debug: print_cubes(cubes)
     # fall
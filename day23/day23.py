@@ -1,10 +1,11 @@
 from collections import deque, defaultdict
 
-from aocd.models import Puzzle
+from common.graph import Graph, dfs, dijkstra
+from common.grid import Grid
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-from day17.day17 import in_bounds
-
-puzzle = Puzzle(year=2023, day=23)
+puzzle = LazyPuzzle(year=2023, day=23)
 
 NEIGHBOURS = [
     (1, 0),
@@ -22,97 +23,136 @@ def can_pass(dy, dx, char):
 
 
 def exit_pos(board):
-    return len(board) - 1, len(board[0]) - 2
+    return board.index(board.height - 1, board.width - 2)
+
+
+def steps(board):
+    """(dy, dx, offset) of every neighbour, in NEIGHBOURS order."""
+    return [(dy, dx, dy * board.stride + dx) for dy, dx in NEIGHBOURS]
 
 
-def find_corridor_end(board, sy, sx):
-    y, x = sy, sx
+def find_corridor_end(board, start):
+    cells = board.cells
+    exit_node = exit_pos(board)
+    neighbours = steps(board)
+    position = start
     length = 0
     visited = set()
     while True:
-        visited.add((y, x))
+        visited.add(position)
         length += 1
-        for dy, dx in NEIGHBOURS:
-            ny, nx = y + dy, x + dx
-            if (ny, nx) in visited:
+        for dy, dx, offset in neighbours:
+            next_position = position + offset
+            if next_position in visited:
                 continue
-            if in_bounds(board, ny, nx):
-                nc = board[ny][nx]
-                if nc == '.' and (ny, nx) == exit_pos(board):
-                    return ny, nx, length
-                if nc == '#':
-                    continue
-                if nc == '.':  # move to next node
-                    y, x = ny, nx
-                    break
-                if can_pass(dy, dx, nc):  # corridor ended
-                    return y, x, length
+            nc = cells[next_position]  # the border is a wall
+            if nc == PATH and next_position == exit_node:
+                return next_position, length
+            if nc == WALL:
+                continue
+            if nc == PATH:  # move to next node
+                position = next_position
+                break
+            if can_pass(dy, dx, chr(nc)):  # corridor ended
+                return position, length
 
 
 SLOPES = ['>', '<', '^', 'v']
 
+PATH, WALL = b'.#'
+
 
+@cached_parse
 def parse(input_data):
-    board = [list(row) for row in input_data.split("\n")]
+    board = Grid.from_text(input_data, border='#')
+    cells = board.cells
+    exit_node = exit_pos(board)
     graph = defaultdict(list)
-    queue = deque([(0, 1)])
+    queue = deque([board.index(0, 1)])
     visited = set()
     while len(queue) > 0:
-        pos_y, pos_x = queue.popleft()
-        if (pos_y, pos_x) in visited:
+        position = queue.popleft()
+        if position in visited:
             continue
-        visited.add((pos_y, pos_x))
-        ey, ex, el = find_corridor_end(board, pos_y, pos_x)
-        if (ey, ex) == exit_pos(board):  # add exit node
-            graph[(pos_y, pos_x)].append((ey, ex, el))
+        visited.add(position)
+        end, length = find_corridor_end(board, position)
+        if end == exit_node:  # add exit node
+            graph[position].append((end, length))
             continue
-        for dy, dx in NEIGHBOURS:
-            ny, nx = ey + dy, ex + dx
-            nc = board[ny][nx]
+        for dy, dx, offset in steps(board):
+            nc = chr(cells[end + offset])
             if nc in SLOPES and can_pass(dy, dx, nc):
-                next_corridor_y, next_corridor_x = ny + dy, nx + dx
-                graph[(pos_y, pos_x)].append((next_corridor_y, next_corridor_x, el + 1))  # +1 to add slope length
-                queue.append((next_corridor_y, next_corridor_x))
-    return graph, board
+                next_corridor = end + 2 * offset
+                graph[position].append((next_corridor, length + 1))  # +1 to add slope length
+                queue.append(next_corridor)
+    return Graph.from_adjacency(graph, weighted=True), board
 
 
 def print_board(board):
-    print('\n'.join([''.join(row) for row in board]))
+    print(board)
 
 
 def find_longest_path(graph, start_node, exit_node):
-    def dfs(node, dist, visited):
-        if node in visited:
-            return -float('inf')
-        if node == exit_node:
-            return dist
-        visited.add(node)
-        max_dist = -float('inf')
-        for (ny, nx, nl) in graph[node]:
-            max_dist = max(max_dist, dfs((ny, nx), dist + nl, visited))
-        visited.remove(node)
-        return max_dist
+    """Backtracking over all simple paths with an explicit stack of (node, next edge, distance)."""
+    offsets, targets, weights = graph.offsets.tolist(), graph.targets.tolist(), graph.weights.tolist()
+    start, exit_id = graph.labels.get(start_node), graph.labels.get(exit_node)
+    if start_node == exit_node:
+        return 0
+    if start == -1 or exit_id not in dfs(graph, start):
+        return -float('inf')
+    max_dist = -float('inf')
+    visited = bytearray(len(graph))
+    visited[start] = 1
+    stack = [(start, offsets[start], 0)]
+    while stack:
+        node, edge, dist = stack[-1]
+        if edge == offsets[node + 1]:
+            stack.pop()
+            visited[node] = 0
+            continue
+        stack[-1] = (node, edge + 1, dist)
+        next_node = targets[edge]
+        if visited[next_node]:
+            continue
+        if next_node == exit_id:
+            max_dist = max(max_dist, dist + weights[edge])
+            continue
+        visited[next_node] = 1
+        stack.append((next_node, offsets[next_node], dist + weights[edge]))
+    return max_dist
 
-    return dfs(start_node, 0, set())
+
+def shortest_hike(input_data):
+    """Fewest steps to the exit over the junction graph, a lower bound for the scenic hike."""
+    graph, board = parse(input_data)
+    start, exit_id = graph.labels.get(board.index(0, 1)), graph.labels.get(exit_pos(board))
+    return dijkstra(graph, start, exit_id)[exit_id]
 
 
 def part1(input_data):
     graph, board = parse(input_data)
     # print_board(board)
-    return find_longest_path(graph, (0, 1), exit_pos(board))
+    return find_longest_path(graph, board.index(0, 1), exit_pos(board))
 
 
 def part2(input_data):
     graph, board = parse(input_data)
-    bidirectional_graph = defaultdict(list)
-    for (ny, nx), edges in graph.items():
-        for ey, ex, el in edges:
-            bidirectional_graph[(ny, nx)].append((ey, ex, el))
-            bidirectional_graph[(ey, ex)].append((ny, nx, el))
-    return find_longest_path(bidirectional_graph, (0, 1), exit_pos(board))
+    bidirectional_graph = Graph.from_edges(graph.edges(), undirected=True)
+    return find_longest_path(bidirectional_graph, board.index(0, 1), exit_pos(board))
 
 
 def main():
+    example = ("#.#######\n"
+               "#.>.#...#\n"
+               "#v#.#.#.#\n"
+               "#.#...#.#\n"
+               "#.#####v#\n"
+               "#.....>.#\n"
+               "#######.#")
+    assert 12 == shortest_hike(example)
+    assert 16 == part1(example)
+    print("shortest hike test OK")
+
     assert 94 == part1(puzzle.examples[0].input_data)
     print("part1 example OK")
 
@@ -1,16 +1,16 @@
-from aocd.models import Puzzle
-from z3 import Int, Solver
+from common.ints import scan_ints
+from common.parse_cache import cached_parse
+from common.puzzle import LazyPuzzle
 
-puzzle = Puzzle(year=2023, day=24)
+puzzle = LazyPuzzle(year=2023, day=24)
 
 
+@cached_parse
 def parse(input_data):
+    values, _ = scan_ints(input_data)
     particles = []
-    for line in input_data.split("\n"):
-        pos, v = line.split(" @ ")
-        pos = list(map(int, pos.split(", ")))
-        v = list(map(int, v.split(", ")))
-        particles.append((pos, v))
+    for x, y, z, vx, vy, vz in zip(*[iter(values)] * 6):  # position @ velocity on every line
+        particles.append(((x, y, z), (vx, vy, vz)))
     return particles
 
 
@@ -57,7 +57,7 @@ def check_intersection(p1, p2, debug=False):
     return x, y
 
 
-def part1(input_data, min_pos, max_pos, debug=False):
+def part1(input_data, min_pos=200000000000000, max_pos=400000000000000, debug=False):
     particles = parse(input_data)
     counter = 0
     for i, p1 in enumerate(particles):
@@ -77,6 +77,8 @@ def part1(input_data, min_pos, max_pos, debug=False):
     return counter
 
 def part2(input_data):
+    from z3 import Int, Solver  # z3 is slow to import, only this part needs it
+
     particles = parse(input_data)
     v0_x = Int('v0_x')
     v0_y = Int('v0_y')
@@ -100,7 +102,7 @@ def main():
     assert 2 == part1(puzzle.examples[0].input_data, 7, 27)
     print("part1 example OK")
 
-    puzzle.answer_a = part1(puzzle.input_data, 200000000000000, 400000000000000)
+    puzzle.answer_a = part1(puzzle.input_data)
     print("part1 OK")
 
     assert 47 == part2(puzzle.examples[0].input_data)
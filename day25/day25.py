@@ -1,15 +1,16 @@
 import random
-import sys
 from collections import defaultdict, deque
 from typing import Dict, List, Tuple
 
-from aocd.models import Puzzle
-from tqdm import tqdm
+from common.graph import Graph, components
+from common.parse_cache import cached_parse
+from common.progress import report_progress
+from common.puzzle import LazyPuzzle
 
-sys.setrecursionlimit(2000)
-puzzle = Puzzle(year=2023, day=25)
+puzzle = LazyPuzzle(year=2023, day=25)
 
 
+@cached_parse
 def parse(input_data) -> Tuple[Dict[str, List[str]], List[Tuple[str, str]]]:
     graph = defaultdict(list)
     edges = []
@@ -50,31 +51,36 @@ def get_spanning_tree(graph):
 
 
 def find_bridge(graph: Dict[str, List[str]]) -> List[Tuple[str, str]]:
-    low = defaultdict()
-    entry_time = {}
-    visited = set()
+    """Tarjan's bridges from the first node, with an explicit stack of (node, parent, next edge)."""
+    network = Graph.from_adjacency(graph)
+    names = network.labels.names
+    offsets, targets = network.offsets.tolist(), network.targets.tolist()
+    low = [0] * len(network)
+    entry_time = [0] * len(network)  # 0 while not visited
     bridges = []
-    time = 0
-
-    def dfs(node, parent):
-        nonlocal time
-        visited.add(node)
-        time += 1
-        low[node] = time
-        entry_time[node] = time
-        for i, neighbour in enumerate(graph[node]):
+    time = 1
+    low[0] = entry_time[0] = time
+    stack = [(0, -1, offsets[0])]
+    while stack:
+        node, parent, edge = stack[-1]
+        if edge < offsets[node + 1]:
+            stack[-1] = (node, parent, edge + 1)
+            neighbour = targets[edge]
             if neighbour == parent:
                 continue
-            if neighbour in visited:
+            if entry_time[neighbour]:
                 low[node] = min(low[node], entry_time[neighbour])
             else:
-                dfs(neighbour, node)
-                low[node] = min(low[node], low[neighbour])
-                if low[neighbour] > entry_time[node]:
-                    print(f'bridge is {node} -> {neighbour}')
-                    bridges.append((node, neighbour))
-
-    dfs(next(iter(graph.keys())), -1)
+                time += 1
+                low[neighbour] = entry_time[neighbour] = time
+                stack.append((neighbour, node, offsets[neighbour]))
+            continue
+        stack.pop()
+        if parent != -1:
+            low[parent] = min(low[parent], low[node])
+            if low[node] > entry_time[parent]:
+                print(f'bridge is {names[parent]} -> {names[node]}')
+                bridges.append((names[parent], names[node]))
     return bridges
 
 
@@ -112,11 +118,14 @@ def part1_slow(input_data):
 
 
 def part1_faster_but_still_slow(input_data):
+    from tqdm import tqdm
+
     graph, edges = parse(input_data)
     progress = tqdm(total=(len(edges) * (len(edges) - 1)) // 2)
     for i, (i1, i2) in enumerate(edges):
         for j, (j1, j2) in enumerate(edges[i + 1:]):
             progress.update()
+            report_progress(pair=progress.n, pairs=progress.total)
             if (i1, i2) == (j1, j2):
                 continue
             graph[i1].remove(i2)
@@ -129,7 +138,8 @@ def part1_faster_but_still_slow(input_data):
                 k1, k2 = bridges[0]
                 graph[k1].remove(k2)
                 graph[k2].remove(k1)
-                subgraph_size = len(get_graph_size(graph, next(iter(graph.keys()))))
+                component, _ = components(Graph.from_adjacency(graph))
+                subgraph_size = component.count(component[0])
                 return subgraph_size * (len(graph) - subgraph_size)
 
             graph[i1].append(i2)
@@ -162,6 +172,7 @@ def kargers_algorithm(input_graph):
             # remove donor node
             del graph[donor]
         attempts += 1
+        report_progress(attempts=attempts)
         # check if finished with 3 edges between two nodes
         if len(graph[list(graph.keys())[0]]) == 3 and len(joined) == 2:
             print(f"cut found after {attempts} attempts")
@@ -1,6 +1,6 @@
-from aocd.models import Puzzle
+from common.puzzle import LazyPuzzle
 
-puzzle = Puzzle(year=2023, day=-1)
+puzzle = LazyPuzzle(year=2023, day=-1)
 
 
 def parse(input_data):
@@ -0,0 +1,572 @@
+"""
+Seeded generators of valid puzzle inputs of any size, for benchmarking the solvers far beyond
+the official inputs. Every dayNN(size, seed) returns the input text; what size means depends
+on the day and is given in each generator's docstring.
+"""
+import argparse
+import random
+from string import ascii_lowercase
+
+DIGIT_WORDS = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
+
+
+def unique_names(rng, count, length, forbidden=()):
+    names = set()
+    forbidden = set(forbidden)
+    while len(names) < count:
+        name = ''.join(rng.choice(ascii_lowercase) for _ in range(length))
+        if name not in forbidden:
+            names.add(name)
+    return sorted(names)
+
+
+def primes(start, end):
+    sieve = [True] * end
+    sieve[0:2] = [False, False]
+    for i in range(2, int(end ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = [False] * len(sieve[i * i::i])
+    return [i for i in range(start, end) if sieve[i]]
+
+
+def random_polyomino(rng, height, width, fill=0.5):
+    """
+    Grows a random 4-connected set of cells inside a height x width grid (border rows and columns
+    excluded) without holes and without cells touching only by a corner, so its outline is a simple polygon.
+    """
+    cells = {(height // 2, width // 2)}
+    frontier = [(height // 2, width // 2)]
+    target = max(1, int(fill * (height - 2) * (width - 2)))
+    while len(cells) < target and frontier:
+        y, x = frontier[rng.randrange(len(frontier))]
+        dy, dx = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
+        ny, nx = y + dy, x + dx
+        if 1 <= ny < height - 1 and 1 <= nx < width - 1 and (ny, nx) not in cells:
+            cells.add((ny, nx))
+            frontier.append((ny, nx))
+    changed = True
+    while changed:
+        changed = False
+        # fill holes: empty cells not reachable from the outside
+        outside = set()
+        queue = [(0, 0)]
+        while queue:
+            y, x = queue.pop()
+            if (y, x) in outside or (y, x) in cells or not (0 <= y < height and 0 <= x < width):
+                continue
+            outside.add((y, x))
+            queue.extend([(y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)])
+        for y in range(height):
+            for x in range(width):
+                if (y, x) not in outside and (y, x) not in cells:
+                    cells.add((y, x))
+                    changed = True
+        # remove corner-only contacts by filling one of the empty cells
+        for y in range(height - 1):
+            for x in range(width - 1):
+                a, b, c, d = (y, x) in cells, (y, x + 1) in cells, (y + 1, x) in cells, (y + 1, x + 1) in cells
+                if a and d and not b and not c:
+                    cells.add((y, x + 1))
+                    changed = True
+                elif b and c and not a and not d:
+                    cells.add((y, x))
+                    changed = True
+    return cells
+
+
+def outline(cells):
+    """Returns corners of the cells' outline in clockwise order (y grows down)."""
+    next_corner = {}
+    for y, x in cells:
+        if (y - 1, x) not in cells:
+            next_corner[(y, x)] = (y, x + 1)
+        if (y, x + 1) not in cells:
+            next_corner[(y, x + 1)] = (y + 1, x + 1)
+        if (y + 1, x) not in cells:
+            next_corner[(y + 1, x + 1)] = (y + 1, x)
+        if (y, x - 1) not in cells:
+            next_corner[(y + 1, x)] = (y, x)
+    start = min(next_corner)
+    corners = [start]
+    corner = next_corner[start]
+    while corner != start:
+        corners.append(corner)
+        corner = next_corner[corner]
+    return corners
+
+
+def day01(size, seed=0):
+    """size: number of lines"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        line = []
+        for _ in range(rng.randint(2, 8)):
+            token = rng.random()
+            if token < 0.3:
+                line.append(str(rng.randint(1, 9)))
+            elif token < 0.6:
+                line.append(rng.choice(DIGIT_WORDS))
+            else:
+                line.append(''.join(rng.choice(ascii_lowercase) for _ in range(rng.randint(1, 5))))
+        line.insert(rng.randrange(len(line) + 1), str(rng.randint(1, 9)))  # part1 needs a digit in every line
+        lines.append(''.join(line))
+    return '\n'.join(lines)
+
+
+def day02(size, seed=0):
+    """size: number of games"""
+    rng = random.Random(seed)
+    lines = []
+    for game in range(1, size + 1):
+        subsets = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(['red', 'green', 'blue'], rng.randint(1, 3))
+            subsets.append(', '.join(f"{rng.randint(1, 20)} {color}" for color in colors))
+        lines.append(f"Game {game}: {'; '.join(subsets)}")
+    return '\n'.join(lines)
+
+
+def day03(size, seed=0):
+    """size: side of the square schematic"""
+    rng = random.Random(seed)
+    board = [['.'] * size for _ in range(size)]
+    for y in range(size):
+        x = 0
+        while x < size:
+            roll = rng.random()
+            if roll < 0.2:
+                number = str(rng.randint(1, 999))
+                if x + len(number) < size:
+                    board[y][x:x + len(number)] = list(number)
+                    x += len(number) + 1  # keep numbers apart
+                    continue
+            elif roll < 0.25:
+                board[y][x] = rng.choice('***#+$/=%@&-')
+            x += 1
+    return '\n'.join(''.join(row) for row in board)
+
+
+def day04(size, seed=0):
+    """size: number of cards"""
+    rng = random.Random(seed)
+    lines = []
+    width = len(str(size))
+    for card in range(1, size + 1):
+        numbers = rng.sample(range(1, 100), 35)
+        winning, other = numbers[:10], numbers[10:]
+        # winning cards can't win copies of cards past the end of the table
+        matches = min(int(rng.expovariate(0.7)), 10, size - card)
+        appeared = winning[:matches] + other[:25 - matches]
+        rng.shuffle(appeared)
+        lines.append(f"Card {card:>{width}}: {' '.join(f'{n:>2}' for n in winning)} | "
+                     f"{' '.join(f'{n:>2}' for n in appeared)}")
+    return '\n'.join(lines)
+
+
+def day05(size, seed=0):
+    """size: number of ranges in every map, values stay below 100 * size"""
+    rng = random.Random(seed)
+    universe = 100 * size
+    seeds = []
+    for _ in range(max(2, size // 5)):
+        start = rng.randrange(universe)
+        seeds += [start, rng.randint(1, max(1, (universe - start) // 10))]
+    names = ['seed', 'soil', 'fertilizer', 'water', 'light', 'temperature', 'humidity', 'location']
+    blocks = [f"seeds: {' '.join(map(str, seeds))}"]
+    for source, destination in zip(names, names[1:]):
+        # a map permutes blocks of [0, universe), so every value still has exactly one mapping
+        cuts = sorted(rng.sample(range(1, universe), size - 1))
+        bounds = list(zip([0] + cuts, cuts + [universe]))
+        shuffled = bounds.copy()
+        rng.shuffle(shuffled)
+        lines = [f"{source}-to-{destination} map:"]
+        destination_start = 0
+        for src_start, src_end in shuffled:
+            lines.append(f"{destination_start} {src_start} {src_end - src_start}")
+            destination_start += src_end - src_start
+        blocks.append('\n'.join(lines))
+    return '\n\n'.join(blocks)
+
+
+def day06(size, seed=0):
+    """size: number of races, part2 joins them into one race with ~10^(2 * size) ms"""
+    rng = random.Random(seed)
+    times = [rng.randint(64, 99) for _ in range(size)]
+    # four digit records below the best distance keep the joined race of part2 winnable
+    records = [rng.randint(1000, t * t // 4 - 1) for t in times]
+    return (f"Time:     {' '.join(f'{t:>4}' for t in times)}\n"
+            f"Distance: {' '.join(f'{r:>4}' for r in records)}")
+
+
+def day07(size, seed=0):
+    """size: number of hands"""
+    rng = random.Random(seed)
+    return '\n'.join(f"{''.join(rng.choice('23456789TJQKA') for _ in range(5))} {rng.randint(1, 1000)}"
+                     for _ in range(size))
+
+
+def day08(size, seed=0):
+    """size: approximate number of nodes, at most 36^3"""
+    rng = random.Random(seed)
+    ghosts = 6
+    moves_count = max(2, primes(2, max(3, int((size / ghosts) ** 0.5)) + 1)[-1])
+    periods = primes(2, 10_000)[:ghosts + 50]
+    period_start = next((i for i, p in enumerate(periods) if moves_count * p * ghosts >= size), len(periods) - ghosts)
+    periods = rng.sample(periods[max(0, period_start - ghosts):period_start + ghosts], ghosts)
+    moves = ''.join(rng.choice('LR') for _ in range(moves_count))
+    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+    inner = [a + b + c for a in alphabet for b in alphabet for c in alphabet if c not in 'AZ']
+    rng.shuffle(inner)
+    inner = iter(inner)
+    nodes = {}
+    prefixes = ['AA'] + [p for p in (a + b for a in alphabet for b in alphabet) if p not in ('AA', 'ZZ')]
+    prefixes = [prefixes[0]] + rng.sample(prefixes[1:], ghosts - 1)
+    for prefix, period in zip(prefixes, periods):
+        # a ghost walks a cycle of moves_count * period nodes, its end node behaves as its start node,
+        # the side not taken leads to a random node of the cycle
+        length = moves_count * period
+        chain = [prefix + 'A'] + [next(inner) for _ in range(length - 1)] + [('ZZ' if prefix == 'AA' else prefix) + 'Z']
+        for i, node in enumerate(chain):
+            position = i % length
+            following = chain[position + 1]
+            decoy = rng.choice(chain)
+            nodes[node] = (following, decoy) if moves[position % moves_count] == 'L' else (decoy, following)
+    lines = [f"{node} = ({left}, {right})" for node, (left, right) in nodes.items()]
+    rng.shuffle(lines)
+    return moves + '\n\n' + '\n'.join(lines)
+
+
+def day09(size, seed=0):
+    """size: number of histories"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 8))]
+        values = [sum(c * x ** i for i, c in enumerate(coefficients)) for x in range(21)]
+        lines.append(' '.join(map(str, values)))
+    return '\n'.join(lines)
+
+
+def day10(size, seed=0):
+    """size: side of the square field, the loop goes around a random blob"""
+    rng = random.Random(seed)
+    coarse = max(4, (size - 1) // 2)
+    corners = outline(random_polyomino(rng, coarse, coarse))
+    # corners sit on even coordinates of the field, steps between them on the odd ones
+    loop = []
+    for (y1, x1), (y2, x2) in zip(corners, corners[1:] + corners[:1]):
+        loop += [(2 * y1, 2 * x1), (y1 + y2, x1 + x2)]
+    directions = {(-1, 0): 'U', (1, 0): 'D', (0, -1): 'L', (0, 1): 'R'}
+    symbols = {frozenset('UD'): '|', frozenset('LR'): '-', frozenset('UR'): 'L', frozenset('UL'): 'J',
+               frozenset('LD'): '7', frozenset('RD'): 'F'}
+    side = 2 * coarse + 1
+    board = [[rng.choice('|-LJ7F...') for _ in range(side)] for _ in range(side)]
+    start = None
+    for i, (y, x) in enumerate(loop):
+        py, px = loop[i - 1]
+        ny, nx = loop[(i + 1) % len(loop)]
+        board[y][x] = symbols[frozenset((directions[(py - y, px - x)], directions[(ny - y, nx - x)]))]
+        if start is None and (ny, nx) == (y, x + 1):
+            start = (y, x)  # the solver follows the pipe on the right of S first
+    sy, sx = start
+    board[sy][sx] = 'S'
+    for dy, dx in [(-1, 0), (1, 0), (0, -1)]:
+        if (sy + dy, sx + dx) not in loop:
+            board[sy + dy][sx + dx] = '.'
+    return '\n'.join(''.join(row) for row in board)
+
+
+def day11(size, seed=0):
+    """size: side of the square image, about 2% of it are galaxies"""
+    rng = random.Random(seed)
+    empty_rows = set(rng.sample(range(size), size // 10))
+    empty_cols = set(rng.sample(range(size), size // 10))
+    board = [['#' if y not in empty_rows and x not in empty_cols and rng.random() < 0.02 else '.'
+              for x in range(size)] for y in range(size)]
+    board[rng.choice([y for y in range(size) if y not in empty_rows])][
+        rng.choice([x for x in range(size) if x not in empty_cols])] = '#'
+    return '\n'.join(''.join(row) for row in board)
+
+
+def day12(size, seed=0):
+    """size: number of rows of springs"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        groups = [rng.randint(1, 4) for _ in range(rng.randint(1, 5))]
+        springs = '.' * rng.randint(0, 2)
+        for group in groups:
+            springs += '#' * group + '.' * rng.randint(1, 2)
+        # part1 tries every combination, keep the unknowns close to the official input
+        hidden = ''.join('?' if rng.random() < 0.4 else c for c in springs[:20]) + springs[20:]
+        lines.append(f"{hidden} {','.join(map(str, groups))}")
+    return '\n'.join(lines)
+
+
+def day13(size, seed=0):
+    """size: number of patterns"""
+    rng = random.Random(seed)
+
+    def mismatches(rows, line):
+        return sum(a != b for up, down in zip(reversed(rows[:line]), rows[line:]) for a, b in zip(up, down))
+
+    def reflections(rows):
+        columns = [''.join(column) for column in zip(*rows)]
+        return ([(100 * line, mismatches(rows, line)) for line in range(1, len(rows))] +
+                [(line, mismatches(columns, line)) for line in range(1, len(columns))])
+
+    patterns = []
+    while len(patterns) < size:
+        height, width = rng.randint(7, 17), rng.randint(7, 17)
+        row_line = rng.randint(1, height // 2 - 1)  # perfect mirror, some rows below it are not mirrored
+        column_line = rng.randint(1, width - 1)  # mirror with a smudge
+        rows = [[None] * width for _ in range(height)]
+        for y in range(height):
+            for x in range(width):
+                if rows[y][x] is None:
+                    value = rng.choice('.#')
+                    my, mx = (2 * row_line - 1 - y, 2 * column_line - 1 - x)
+                    for cy, cx in [(y, x), (my, x), (y, mx), (my, mx)]:
+                        if 0 <= cy < height and 0 <= cx < width and rows[cy][cx] is None:
+                            rows[cy][cx] = value
+        smudge_x = rng.randrange(max(0, 2 * column_line - width), min(width, 2 * column_line))
+        smudge_y = rng.randrange(2 * row_line, height)
+        rows[smudge_y][smudge_x] = '.' if rows[smudge_y][smudge_x] == '#' else '#'
+        rows = [''.join(row) for row in rows]
+        if rng.random() < 0.5:
+            rows = [''.join(column) for column in zip(*rows)]
+        # the solver needs exactly one perfect mirror and one mirror with a single smudge
+        found = reflections(rows)
+        if [m for _, m in found].count(0) == 1 and [m for _, m in found].count(1) == 1:
+            patterns.append('\n'.join(rows))
+    return '\n\n'.join(patterns)
+
+
+def day14(size, seed=0):
+    """size: side of the square platform"""
+    rng = random.Random(seed)
+    return '\n'.join(''.join(rng.choices('O#.', weights=[2, 1, 5], k=size)) for _ in range(size))
+
+
+def day15(size, seed=0):
+    """size: number of steps"""
+    rng = random.Random(seed)
+    labels = [''.join(rng.choice(ascii_lowercase) for _ in range(rng.randint(2, 6)))
+              for _ in range(max(1, size // 5))]
+    steps = []
+    for _ in range(size):
+        label = rng.choice(labels)
+        steps.append(f"{label}-" if rng.random() < 0.3 else f"{label}={rng.randint(1, 9)}")
+    return ','.join(steps)
+
+
+def day16(size, seed=0):
+    """size: side of the square contraption"""
+    rng = random.Random(seed)
+    return '\n'.join(''.join(rng.choices('./\\|-', weights=[40, 2, 2, 2, 2], k=size)) for _ in range(size))
+
+
+def day17(size, seed=0):
+    """size: side of the square city"""
+    rng = random.Random(seed)
+    return '\n'.join(''.join(rng.choice('123456789') for _ in range(size)) for _ in range(size))
+
+
+def day18(size, seed=0):
+    """size: number of dig instructions, rounded up to an even number"""
+    rng = random.Random(seed)
+
+    def staircase(steps, max_length):
+        # clockwise: right and down steps, then back left and up
+        segments = []
+        for _ in range(steps):
+            segments += [('R', rng.randint(1, max_length)), ('D', rng.randint(1, max_length))]
+        segments += [('L', sum(length for d, length in segments if d == 'R')),
+                     ('U', sum(length for d, length in segments if d == 'D'))]
+        return segments
+
+    steps = max(1, (size - 2 + 1) // 2)
+    dug = staircase(steps, 10)
+    # lengths of part2 are five hex digits
+    hidden = staircase(steps, 0xfffff // (steps + 1))
+    lines = []
+    for (direction, length), (hidden_direction, hidden_length) in zip(dug, hidden):
+        lines.append(f"{direction} {length} (#{hidden_length:05x}{'RDLU'.index(hidden_direction)})")
+    return '\n'.join(lines)
+
+
+def day19(size, seed=0):
+    """size: number of workflows and of parts"""
+    rng = random.Random(seed)
+    names = ['in'] + unique_names(rng, size - 1, 3, forbidden={'in'})
+    # workflows form a tree, so every part ends in A or R
+    children = {name: [] for name in names}
+    for i, name in enumerate(names[1:], start=1):
+        children[names[rng.randrange(i)]].append(name)
+    lines = []
+    for name in names:
+        targets = children[name] + [rng.choice('AR') for _ in range(rng.randint(1, 3))]
+        rng.shuffle(targets)
+        default = targets.pop()
+        rules = [f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(2, 3999)}:{target}" for target in targets]
+        lines.append(f"{name}{{{','.join(rules + [default])}}}")
+    rng.shuffle(lines)
+    parts = ['{' + ','.join(f"{c}={rng.randint(1, 4000)}" for c in 'xmas') + '}' for _ in range(size)]
+    return '\n'.join(lines) + '\n\n' + '\n'.join(parts)
+
+
+def day20(size, seed=0):
+    """size: number of flip-flops, grouped in 12 bit counters like the official input"""
+    rng = random.Random(seed)
+    bits = 12
+    counters = max(1, size // bits)
+    while len(primes(2 ** (bits - 1), 2 ** bits)) < counters:
+        bits += 1
+    periods = rng.sample(primes(2 ** (bits - 1) + 1, 2 ** bits), counters)
+    names = iter(unique_names(rng, counters * (bits + 2) + 1, 4))
+    final = next(names)
+    lines = [f"&{final} -> rx"]
+    starts = []
+    for period in periods:
+        # flip-flops count presses in binary, the conjunction sees the set bits of the period,
+        # resets the counter by flipping the unset ones and signals the final conjunction via an inverter
+        flip_flops = [next(names) for _ in range(bits)]
+        conjunction, inverter = next(names), next(names)
+        starts.append(flip_flops[0])
+        for bit, flip_flop in enumerate(flip_flops):
+            outputs = [flip_flops[bit + 1]] if bit + 1 < bits else []
+            if period >> bit & 1:
+                outputs.append(conjunction)
+            lines.append(f"%{flip_flop} -> {', '.join(outputs)}")
+        reset = [flip_flops[bit] for bit in range(bits) if not period >> bit & 1] + [flip_flops[0]]
+        lines.append(f"&{conjunction} -> {', '.join(reset + [inverter])}")
+        lines.append(f"&{inverter} -> {final}")
+    rng.shuffle(lines)
+    return f"broadcaster -> {', '.join(starts)}\n" + '\n'.join(lines)
+
+
+def day21(size, seed=0):
+    """size: side of the square garden, made odd, S in the middle with clear middle row, column and border"""
+    rng = random.Random(seed)
+    size = max(5, size | 1)
+    middle = size // 2
+    board = [['#' if rng.random() < 0.1 else '.' for _ in range(size)] for _ in range(size)]
+    for i in range(size):
+        for y, x in [(middle, i), (i, middle), (0, i), (size - 1, i), (i, 0), (i, size - 1)]:
+            board[y][x] = '.'
+    board[middle][middle] = 'S'
+    return '\n'.join(''.join(row) for row in board)
+
+
+def day22(size, seed=0):
+    """size: number of bricks, stacked over a 10 x 10 area"""
+    rng = random.Random(seed)
+    lines = []
+    occupied = set()
+    height = max(2, size // 4)  # about four bricks per layer, like the official input
+    while len(lines) < size:
+        x, y, z = rng.randrange(10), rng.randrange(10), rng.randint(1, height)
+        length = rng.randint(0, 4)
+        axis = rng.choice('xyz')
+        end_x = min(9, x + length) if axis == 'x' else x
+        end_y = min(9, y + length) if axis == 'y' else y
+        end_z = z + length if axis == 'z' else z
+        cubes = {(cx, cy, cz) for cx in range(x, end_x + 1) for cy in range(y, end_y + 1)
+                 for cz in range(z, end_z + 1)}
+        if cubes & occupied:  # snapshot bricks never overlap
+            continue
+        occupied |= cubes
+        lines.append(f"{x},{y},{z}~{end_x},{end_y},{end_z}")
+    return '\n'.join(lines)
+
+
+def day23(size, seed=0):
+    """size: junctions per side of the trail grid, the official input has 6"""
+    rng = random.Random(seed)
+    gaps = [rng.randint(4, 30) for _ in range(2 * size - 2)]
+    ys = [3]
+    xs = [1]
+    for gap in gaps[:size - 1]:
+        ys.append(ys[-1] + gap)
+    for gap in gaps[size - 1:]:
+        xs.append(xs[-1] + gap)
+    height, width = ys[-1] + 4, xs[-1] + 2
+    board = [['#'] * width for _ in range(height)]
+
+    def dig(y1, x1, y2, x2, slope):
+        for y in range(y1, y2 + 1):
+            for x in range(x1, x2 + 1):
+                board[y][x] = '.'
+        # slopes around junctions only let the walk go right and down
+        if y1 == y2:
+            board[y1][x1 + 1] = board[y1][x2 - 1] = slope
+        else:
+            board[y1 + 1][x1] = board[y2 - 1][x1] = slope
+
+    for i, y in enumerate(ys):
+        for j, x in enumerate(xs):
+            if j + 1 < size:
+                dig(y, x, y, xs[j + 1], '>')
+            if i + 1 < size:
+                dig(y, x, ys[i + 1], x, 'v')
+    dig(0, 1, ys[0], 1, 'v')
+    board[0][1] = '.'  # start has no junction above it
+    dig(ys[-1], xs[-1], height - 1, xs[-1], 'v')
+    board[height - 1][xs[-1]] = '.'
+    return '\n'.join(''.join(row) for row in board)
+
+
+def day24(size, seed=0):
+    """size: number of hailstones, all of them are hit by one rock thrown at integer time"""
+    rng = random.Random(seed)
+    rock = [rng.randint(250_000_000_000_000, 350_000_000_000_000) for _ in range(3)]
+    rock_velocity = [rng.randint(-100, 100) for _ in range(3)]
+    times = rng.sample(range(1, 1_000_000_000_000), size)
+    lines = []
+    for t in times:
+        velocity = [rng.choice([v for v in range(-300, 301) if v != 0]) for _ in range(3)]
+        position = [p + (rv - v) * t for p, rv, v in zip(rock, rock_velocity, velocity)]
+        lines.append(f"{', '.join(map(str, position))} @ {', '.join(map(str, velocity))}")
+    return '\n'.join(lines)
+
+
+def day25(size, seed=0):
+    """size: number of components, split in two well connected halves joined by three wires"""
+    rng = random.Random(seed)
+    names = unique_names(rng, max(10, size), 3)
+    rng.shuffle(names)
+    half = len(names) // 2
+    edges = set()
+    for group in (names[:half], names[half:]):
+        for name in group:
+            for other in rng.sample([g for g in group if g != name], 4):  # every component has degree >= 4
+                edges.add(tuple(sorted((name, other))))
+    cut = set()
+    while len(cut) < 3:
+        cut.add(tuple(sorted((rng.choice(names[:half]), rng.choice(names[half:])))))
+    edges |= cut
+    graph = {}
+    for a, b in sorted(edges):
+        graph.setdefault(a, []).append(b)
+    return '\n'.join(f"{name}: {' '.join(neighbours)}" for name, neighbours in graph.items())
+
+
+GENERATORS = {
+    1: day01, 2: day02, 3: day03, 4: day04, 5: day05, 6: day06, 7: day07, 8: day08, 9: day09, 10: day10,
+    11: day11, 12: day12, 13: day13, 14: day14, 15: day15, 16: day16, 17: day17, 18: day18, 19: day19, 20: day20,
+    21: day21, 22: day22, 23: day23, 24: day24, 25: day25,
+}
+
+
+def generate(day, size, seed=0):
+    return GENERATORS[day](size, seed)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate a puzzle input of the given size")
+    parser.add_argument('day', type=int)
+    parser.add_argument('size', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(generate(args.day, args.size, args.seed))
@@ -0,0 +1,138 @@
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+
+from run_all import load_day
+
+TARGET = re.compile(r"^day(\d+)\.(part[12]\w*)$")
+
+
+def resolve(target):
+    """Turns 'day16.part1' (or a variant like 'day14.part2_faster') into the function and its puzzle."""
+    match = TARGET.match(target)
+    if match is None:
+        raise ValueError(f"Expected a target like day16.part1, got {target}")
+    module = load_day(int(match.group(1)))
+    if not hasattr(module, match.group(2)):
+        raise ValueError(f"day{int(match.group(1)):02} has no {match.group(2)}")
+    return getattr(module, match.group(2)), module.puzzle
+
+
+class StackSampler(threading.Thread):
+    """Samples the stack of the profiled thread every interval and counts collapsed stacks rooted at func."""
+
+    def __init__(self, thread_id, func, interval=0.001):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.root = func.__code__
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                if code is self.root:  # frames above belong to the runner
+                    self.stacks[';'.join(reversed(names))] += 1
+                    break
+                frame = frame.f_back
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def write(self, path):
+        """One 'frame;frame;frame count' line per stack, the input format of flamegraph.pl and speedscope."""
+        with open(path, 'w') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+def profile_part(target, output_dir='profile', top=20):
+    func, puzzle = resolve(target)
+    input_data = puzzle.input_data
+    os.makedirs(output_dir, exist_ok=True)
+    profiler = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident(), func)
+    sampler.start()
+    try:
+        answer = profiler.runcall(func, input_data)
+    finally:
+        sampler.stop()
+    stats_path = os.path.join(output_dir, f"{target}.pstats")
+    collapsed_path = os.path.join(output_dir, f"{target}.collapsed")
+    profiler.dump_stats(stats_path)
+    sampler.write(collapsed_path)
+    pstats.Stats(profiler).sort_stats('cumulative').print_stats(top)
+    print(f"{target} answer {answer}, wrote {stats_path} and {collapsed_path}")
+    return answer
+
+
+class PeakSnapshotter(threading.Thread):
+    """Polls traced memory and keeps a snapshot taken close to the peak, so its allocation sites can be shown."""
+
+    def __init__(self, interval=0.01, growth=1.1):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.growth = growth
+        self.size = 0
+        self.snapshot = None
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            current = tracemalloc.get_traced_memory()[0]
+            if current > self.size * self.growth:
+                self.snapshot = tracemalloc.take_snapshot()
+                self.size = current
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def trace_allocations(func, input_data, top=10):
+    """
+    Runs func under tracemalloc. Returns its answer, the peak of traced memory and
+    the top allocation sites alive near the peak that weren't there before the call.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        snapshotter = PeakSnapshotter()
+        snapshotter.start()
+        try:
+            answer = func(input_data)
+        finally:
+            snapshotter.stop()
+        peak = tracemalloc.get_traced_memory()[1]
+        at_peak = snapshotter.snapshot or tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    # allocations of the tracing machinery itself
+    ignored = [tracemalloc.Filter(False, path) for path in (__file__, tracemalloc.__file__, threading.__file__,
+                                                            '*/_weakrefset.py')]
+    stats = at_peak.filter_traces(ignored).compare_to(before.filter_traces(ignored), 'lineno')
+    sites = [{'site': f"{os.path.relpath(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+              'size': stat.size_diff,
+              'count': stat.count_diff}
+             for stat in sorted(stats, key=lambda stat: stat.size_diff, reverse=True)[:top] if stat.size_diff > 0]
+    return answer, peak, sites
+
+
+def print_allocations(timings):
+    for t in timings:
+        if 'traced_peak' not in t:
+            continue
+        print(f"day {t['day']} {t['part']}: traced peak {t['traced_peak'] / 1024:.1f} KiB")
+        for site in t['allocations']:
+            print(f"    {site['size'] / 1024:>10.1f} KiB {site['count']:>8} blocks  {site['site']}")
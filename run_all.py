@@ -1,61 +1,354 @@
-from time import monotonic
-
-from day01 import day01
-from day02 import day02
-from day03 import day03
-from day04 import day04
-from day05 import day05
-from day06 import day06
-from day07 import day07
-from day08 import day08
-from day09 import day09
-from day10 import day10
-from day11 import day11
-from day12 import day12
-from day13 import day13
-from day14 import day14
-from day15 import day15
-from day16 import day16
-from day17 import day17
-from day18 import day18
-from day19 import day19
-from day20 import day20
-from day21 import day21
-from day22 import day22
-from day23 import day23
-from day24 import day24
-from day25 import day25
-
-
-def main():
+import argparse
+import ast
+import contextlib
+import functools
+import importlib
+import inspect
+import json
+import os
+import statistics
+import subprocess
+import sys
+from multiprocessing import cpu_count
+from resource import getrusage, RUSAGE_SELF
+from time import monotonic, perf_counter, process_time
+
+from common import memo, parse_cache
+from common.puzzle import set_provider
+from common.reader import MappedInput
+from common.result_cache import cached_call, invalidate
+from common.watchdog import Watched, ready
+
+PARTS = ['part1', 'part2']
+
+SLOW_DAYS = [22, 23, 25, 5]  # scheduled first so they don't end up as the tail of a parallel run
+
+
+def load_day(day):
+    return importlib.import_module(f"day{day:02}.day{day:02}")
+
+
+def parse_days(text):
+    days = []
+    for chunk in text.split(','):
+        start, _, end = chunk.partition('-')
+        days.extend(range(int(start), int(end or start) + 1))
+    return days
+
+
+def parse_parts(text):
+    """Parts like "1,2" or function names like "part2_naive"."""
+    return [f"part{name}" if name.isdigit() else name for name in text.split(',')]
+
+
+def parse_param(text):
+    """name=value, the value is a Python literal if it reads as one, e.g. empty_space_size=10."""
+    name, _, value = text.partition('=')
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return name, value
+
+
+def run_selected(days, parts, input_path=None, mapped=False, repeat=1, params=None, use_cache=True):
+    """
+    Runs the chosen parts repeat times on their puzzle input or the given file, passing each part
+    the params its signature accepts. A single run takes the answer cached for the same input and params
+    unless use_cache is off, repeated runs are timings and a mapped file isn't hashed, so those always run.
+    Returns one result per part with its answer and run times.
+    """
+    from benchmark import clear_caches
+
+    params = params or {}
+    use_cache = use_cache and repeat == 1
+    unused = set(params)
+    results = []
+    text = None
+    if input_path and not mapped:
+        with open(input_path) as file:
+            text = file.read().rstrip('\n')  # like aocd's input_data
+    for day in days:
+        module = load_day(day)
+        if not input_path:
+            text = module.puzzle.input_data
+        for part in parts:
+            func = getattr(module, part, None)
+            if func is None:  # e.g. part2 of day 25
+                print(f"day{day:02} has no {part}", file=sys.stderr)
+                continue
+            signature = inspect.signature(func).parameters
+            kwargs = {name: value for name, value in params.items() if name in signature}
+            unused -= kwargs.keys()
+            if kwargs.keys() != params.keys():
+                print(f"day{day:02}.{part} doesn't take {', '.join(sorted(params.keys() - kwargs.keys()))}",
+                      file=sys.stderr)
+            missing = [name for name, p in list(signature.items())[1:] if p.default is p.empty and name not in kwargs]
+            if missing:
+                print(f"skipping day{day:02}.{part}, it needs {', '.join(missing)}", file=sys.stderr)
+                continue
+            runs = []
+            for _ in range(repeat):
+                # a mapped file is opened per run, the parts walk it only once
+                with MappedInput(input_path) if mapped else contextlib.nullcontext(text) as input_data:
+                    clear_caches(func)
+                    start = perf_counter()
+                    if mapped:  # answers are keyed by the input text, which a mapped file never is whole
+                        answer, cached = func(input_data, **kwargs), False
+                    else:
+                        answer, cached = cached_call(module, part, input_data, kwargs, use_cache)
+                    runs.append(perf_counter() - start)
+            results.append({'day': day, 'part': part, 'params': kwargs, 'answer': answer, 'cached': cached,
+                            'min': min(runs), 'median': statistics.median(runs), 'runs': runs})
+    if unused:
+        print(f"no selected part takes {', '.join(sorted(unused))}", file=sys.stderr)
+    return results
+
+
+def print_results(results):
+    print(f"{'day':>3} {'part':<20} {'min [s]':>10} {'median [s]':>10}  answer")
+    for r in results:
+        print(f"{r['day']:>3} {r['part']:<20} {r['min']:>10.3f} {r['median']:>10.3f}  "
+              f"{r['answer']}{'  (cached)' if r['cached'] else ''}")
+
+
+@contextlib.contextmanager
+def cached_parts(module, use_cache=True):
+    """
+    Routes the day's parts through cached_call while the block runs, so its main() takes the stored
+    answer of every example and the puzzle input it checks, keyed by the arguments it passes.
+    """
+    originals = {part: getattr(module, part) for part in PARTS if hasattr(module, part)}
+
+    def cached(part, func):
+        signature = inspect.signature(func)
+        input_name = next(iter(signature.parameters))
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            params = signature.bind(*args, **kwargs).arguments
+            input_data = params.pop(input_name)
+            if not isinstance(input_data, str):  # e.g. a MappedInput, answers are keyed by the input text
+                return func(input_data, **params)
+            return cached_call(module, part, input_data, params, use_cache)[0]
+
+        return call
+
+    for part, func in originals.items():
+        setattr(module, part, cached(part, func))
+    try:
+        yield
+    finally:
+        for part, func in originals.items():
+            setattr(module, part, func)
+
+
+def main(days=range(1, 26), use_cache=True):
     start_time = monotonic()
-    day01.main()
-    day02.main()
-    day03.main()
-    day04.main()
-    day05.main()
-    day06.main()
-    day07.main()
-    day08.main()
-    day09.main()
-    day10.main()
-    day11.main()
-    day12.main()
-    day13.main()
-    day14.main()
-    day15.main()
-    day16.main()
-    day17.main()
-    day18.main()
-    day19.main()
-    day20.main()
-    day21.main()
-    day22.main()
-    day23.main()
-    day24.main()
-    day25.main()
+    for day in days:
+        module = load_day(day)
+        with cached_parts(module, use_cache):
+            module.main()
     print(monotonic() - start_time, "seconds")
 
 
+def run_part(task):
+    day, part, memory, use_cache = task
+    module = load_day(day)
+    if not hasattr(module, part):  # day 25 has no second part
+        return None
+    input_data = module.puzzle.input_data
+    start_wall, start_cpu = perf_counter(), process_time()
+    cached = False
+    if memory:
+        from profiling import trace_allocations
+
+        answer, traced_peak, allocations = trace_allocations(getattr(module, part), input_data)
+    else:
+        answer, cached = cached_call(module, part, input_data, use_cache=use_cache)
+    wall, cpu = perf_counter() - start_wall, process_time() - start_cpu
+    memo.save_all()
+    timing = {
+        'day': day,
+        'part': part,
+        'answer': answer,
+        'wall': wall,
+        'cpu': cpu,
+        'peak_rss_kb': getrusage(RUSAGE_SELF).ru_maxrss,
+        'cached': cached,
+    }
+    if memory:  # tracing slows the part down, its times aren't comparable with untraced runs
+        timing['traced_peak'] = traced_peak
+        timing['allocations'] = allocations
+    return timing
+
+
+def run_parts(tasks, workers, budget=None, budgets=None):
+    """
+    Runs every task in a fresh process, at most workers at once, so both parts of a day run side by
+    side. A part which runs longer than its budget in seconds (budgets by name like day05.part2,
+    else budget, None for no limit) is killed and returned with its last reported progress.
+    Returns timings of finished parts and the parts which timed out or failed.
+    """
+    budgets = budgets or {}
+    pending = list(tasks)
+    running = {}
+    timings, failures = [], []
+    while pending or running:
+        while pending and len(running) < workers:
+            task = pending.pop(0)
+            day, part = task[:2]
+            running[Watched(run_part, (task,), budgets.get(f"day{day:02}.{part}", budget))] = task
+        for watched in ready(running):
+            if watched.connection.poll():
+                outcome = watched.receive()
+                if outcome is None:  # a progress update
+                    continue
+            else:
+                watched.stop()
+                outcome = 'timed out', None
+            day, part = running.pop(watched)[:2]
+            kind, value = outcome
+            if kind != 'done':
+                failures.append({'day': day, 'part': part, 'reason': kind, 'detail': value,
+                                 'wall': watched.elapsed, 'progress': watched.progress})
+            elif value is not None:  # day 25 has no second part
+                timings.append(value)
+    return timings, failures
+
+
+def schedule(days, memory=False, use_cache=False):
+    ordered = [day for day in SLOW_DAYS if day in days] + [day for day in days if day not in SLOW_DAYS]
+    return [(day, part, memory, use_cache) for day in ordered for part in PARTS]
+
+
+def print_timings(timings, total):
+    print(f"{'day':>3} {'part':<5} {'wall [s]':>10} {'cpu [s]':>10} {'peak rss [MB]':>14}  answer")
+    for t in timings:
+        print(f"{t['day']:>3} {t['part'][-1]:<5} {t['wall']:>10.3f} {t['cpu']:>10.3f} "
+              f"{t['peak_rss_kb'] / 1024:>14.1f}  {t['answer']}{'  (cached)' if t['cached'] else ''}")
+    print(f"total {total:.3f} seconds, sum of parts {sum(t['wall'] for t in timings):.3f} seconds")
+
+
+def print_failures(failures):
+    for f in failures:
+        state = ', '.join(f"{key} {value}" for key, value in f['progress'].items()) if f['progress'] else 'none reported'
+        detail = f" ({f['detail']})" if f['detail'] else ''
+        print(f"{f['day']:>3} {f['part'][-1]:<5} {f['reason']} after {f['wall']:.3f} s{detail}, progress: {state}")
+
+
+def main_parallel(days, workers, report_path, memory=False, use_cache=False, budget=None, budgets=None):
+    start_time = perf_counter()
+    # one process per part, so ru_maxrss is the peak of that part alone and a runaway part can be killed
+    timings, failures = run_parts(schedule(days, memory, use_cache), workers, budget, budgets)
+    total = perf_counter() - start_time
+    timings.sort(key=lambda t: (t['day'], t['part']))
+    failures.sort(key=lambda f: (f['day'], f['part']))
+    print_timings(timings, total)
+    print_failures(failures)
+    if memory:
+        from profiling import print_allocations
+
+        print_allocations(timings)
+    with open(report_path, 'w') as report:
+        json.dump({'total': total, 'timings': timings, 'failures': failures}, report, indent=2, default=str)
+
+
+STARTUP_PROBE = """
+import importlib, json, sys
+from time import perf_counter
+start = perf_counter()
+modules = [importlib.import_module(name) for name in sys.argv[1:]]
+imported = perf_counter()
+try:
+    for module in modules:
+        module.puzzle._load()
+    puzzle = perf_counter() - imported
+except Exception:  # e.g. no aocd token on this machine
+    puzzle = None
+print(json.dumps({'import': imported - start, 'puzzle': puzzle}))
+"""
+
+
+def measure_startup(days):
+    """
+    Measures import and Puzzle construction time of each day in a fresh interpreter,
+    plus the cost of importing all of them at once like run_all used to do.
+    """
+
+    def probe(module_names):
+        output = subprocess.run([sys.executable, '-c', STARTUP_PROBE, *module_names], check=True,
+                                capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return json.loads(output.stdout)
+
+    names = {day: f"day{day:02}.day{day:02}" for day in days}
+    print(f"{'day':>3} {'import [ms]':>12} {'puzzle [ms]':>12}")
+    for day, name in names.items():
+        result = probe([name])
+        puzzle = f"{result['puzzle'] * 1000:>12.1f}" if result['puzzle'] is not None else f"{'-':>12}"
+        print(f"{day:>3} {result['import'] * 1000:>12.1f} {puzzle}")
+    result = probe(list(names.values()))
+    print(f"all days imported eagerly: {result['import'] * 1000:.1f} ms")
+
+
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Run all Advent of Code 2023 solutions")
+    parser.add_argument('--parallel', action='store_true', help="run every part on a process pool")
+    parser.add_argument('--workers', type=int, default=cpu_count())
+    parser.add_argument('--report', default='timings.json', help="where to write per-part timings")
+    parser.add_argument('--offline', action='store_true',
+                        help="read puzzles from the local store and record answers instead of submitting them")
+    parser.add_argument('--startup', action='store_true', help="measure import and Puzzle construction cost")
+    parser.add_argument('--profile', metavar='TARGET', action='append',
+                        help="profile e.g. day16.part1 into profile/ as pstats and collapsed stacks, can be repeated")
+    parser.add_argument('--memory', action='store_true',
+                        help="trace every part with tracemalloc and report its peak and top allocation sites")
+    parser.add_argument('--no-cache', action='store_true', help="run every part even if its answer is cached")
+    parser.add_argument('--cached-timings', action='store_true',
+                        help="let --parallel runs take cached answers too, their times are then near zero")
+    parser.add_argument('--parse-cache', action='store_true', help="load parsed inputs from .cache/parsed")
+    parser.add_argument('--memo-cache', action='store_true', help="keep memoized solver results in .cache/memo")
+    parser.add_argument('--invalidate', action='store_true', help="remove cached answers of the selected --days before running")
+    parser.add_argument('--budget', type=float, help="kill a part of the parallel run after this many seconds")
+    parser.add_argument('--part-budget', metavar='PART=SECONDS', action='append', default=[],
+                        help="budget of one part like day05.part2=30, can be repeated")
+    parser.add_argument('--days', type=parse_days, default=list(range(1, 26)), help="e.g. 1-5,11")
+    parser.add_argument('--parts', type=parse_parts,
+                        help="run only these parts, e.g. 1 or part2_naive, instead of each day's main()")
+    parser.add_argument('--input', metavar='FILE', help="run the parts on this file instead of the puzzle input")
+    parser.add_argument('--mmap', action='store_true', help="pass --input as a memory-mapped MappedInput")
+    parser.add_argument('--repeat', type=int, default=1, help="run every selected part this many times")
+    parser.add_argument('--param', type=parse_param, action='append', default=[], metavar='NAME=VALUE',
+                        help="keyword argument of the parts which take it, e.g. steps=1000, can be repeated")
+    parser.add_argument('--json', action='store_true', help="print results of the selected parts as json")
+    args = parser.parse_args()
+    selected = args.parts or args.input or args.param or args.repeat > 1 or args.json
+    if args.invalidate:
+        print(f"removed {invalidate(args.days)} cached answers")
+    if args.offline:
+        set_provider('local')
+    if args.parse_cache:
+        parse_cache.enable()
+    if args.memo_cache:
+        memo.enable()
+    if args.profile:
+        from profiling import profile_part
+
+        for target in args.profile:
+            profile_part(target)
+    elif args.startup:
+        measure_startup(args.days)
+    elif selected:
+        # solvers print progress, keep it out of the json
+        with contextlib.redirect_stdout(sys.stderr if args.json else sys.stdout):
+            results = run_selected(args.days, args.parts or PARTS, args.input, args.mmap, args.repeat,
+                                   dict(args.param), not args.no_cache)
+        if args.json:
+            print(json.dumps(results, indent=2, default=str))
+        else:
+            print_results(results)
+    elif args.parallel or args.memory or args.budget is not None or args.part_budget:
+        budgets = {name: float(seconds) for name, _, seconds in (item.partition('=') for item in args.part_budget)}
+        main_parallel(args.days, args.workers, args.report, args.memory, args.cached_timings and not args.no_cache,
+                      args.budget, budgets)
+    else:
+        main(args.days, not args.no_cache)
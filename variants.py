@@ -0,0 +1,164 @@
+import argparse
+import functools
+import json
+import math
+import sys
+
+from benchmark import measure_generated
+from common.watchdog import call_with_timeout
+from complexity import BASE_SIZES
+from run_all import load_day
+
+
+def cycle_detector(name):
+    return lambda module, input_data: {'cycle_det_func': getattr(module, name)}
+
+
+def garden_steps(repeats=2):
+    """Steps ending on the edge of a garden copy like the puzzle's 26501365 does, which part2's formula needs."""
+
+    def arguments(module, input_data):
+        size = input_data.index('\n')
+        return {'steps': size // 2 + repeats * size}
+
+    return arguments
+
+
+# family: (day, [(variant, function, keyword arguments for the input)])
+# the first variant is the reference the others are compared with
+FAMILIES = {
+    'day06.part2': (6, [
+        ('part2', 'part2', None),
+        ('part2_optimised', 'part2_optimised', None),
+    ]),
+    'day08.part2': (8, [
+        ('part2', 'part2', None),
+        ('part2_faster', 'part2_faster', None),
+    ]),
+    'day14.part2': (14, [
+        (name, 'part2', cycle_detector(name))
+        for name in ['find_naive_cycle', 'find_subarray_cycle', 'find_hash_cycle', 'tortoise_and_hare']
+    ]),
+    'day21.part2': (21, [
+        ('part2_naive', 'part2_naive', garden_steps()),
+        ('part2', 'part2', garden_steps()),
+    ]),
+    'day25.part1': (25, [
+        ('part1_slow', 'part1_slow', None),
+        ('part1_faster_but_still_slow', 'part1_faster_but_still_slow', None),
+        ('part1', 'part1', None),
+    ]),
+}
+
+
+def measure(family, index, size, seed, repeat):
+    """The variant at index of the family on one size, its keyword arguments made from the module and input."""
+    day, variants = FAMILIES[family]
+    _, function, arguments = variants[index]
+    module = load_day(day)
+    return measure_generated(day, getattr(module, function), size, seed, repeat,
+                             functools.partial(arguments, module) if arguments else None)
+
+
+def run_family(family, steps, factor, seed, repeat, timeout):
+    """
+    Times every variant of the family on the same generated inputs of growing size.
+    A variant which doesn't finish in timeout seconds or fails isn't run on bigger inputs.
+    Returns {variant: [measurement, ...]}.
+    """
+    day, variants = FAMILIES[family]
+    size = BASE_SIZES[day]
+    results = {name: [] for name, _, _ in variants}
+    active = list(range(len(variants)))
+    for _ in range(steps):
+        for index in list(active):
+            name = variants[index][0]
+            try:
+                results[name].append(call_with_timeout(measure, (family, index, size, seed, repeat), timeout))
+            except TimeoutError:
+                print(f"{family} {name} size {size} didn't finish in {timeout} s")
+                active.remove(index)
+            except RuntimeError as e:  # the variant raised or its process died
+                print(f"{family} {name} size {size} failed: {e}")
+                active.remove(index)
+        size = math.ceil(size * factor)
+    return results
+
+
+def disagreements(results):
+    """Sizes on which finished variants gave different answers."""
+    answers = {}
+    for measurements in results.values():
+        for m in measurements:
+            answers.setdefault(m['size'], set()).add(repr(m['answer']))
+    return sorted(size for size, found in answers.items() if len(found) > 1)
+
+
+def crossover(reference, variant):
+    """
+    Smallest size from which the variant is faster than the reference on every bigger size, a size the
+    reference didn't finish counts as a win. None if it isn't faster on the biggest size.
+    """
+    reference_times = {m['size']: m['time'] for m in reference}
+    since = None
+    for m in variant:
+        if m['time'] < reference_times.get(m['size'], math.inf):
+            since = m['size'] if since is None else since
+        else:
+            since = None
+    return since
+
+
+def print_family(family, results):
+    names = list(results)
+    sizes = sorted({m['size'] for measurements in results.values() for m in measurements})
+    times = {name: {m['size']: m['time'] for m in measurements} for name, measurements in results.items()}
+    width = max(12, *(len(name) for name in names))
+    print(family)
+    print(f"{'size':>8} " + ' '.join(f"{name:>{width}}" for name in names))
+    for size in sizes:
+        cells = [f"{times[name][size] * 1000:>{width - 3}.2f} ms" if size in times[name] else f"{'-':>{width}}"
+                 for name in names]
+        print(f"{size:>8} " + ' '.join(cells))
+    reference = names[0]
+    for name in names[1:]:
+        common = [size for size in sizes if size in times[name] and size in times[reference]]
+        speedup = (f"{times[reference][common[-1]] / times[name][common[-1]]:.2f}x at size {common[-1]}"
+                   if common else "no common size")
+        since = crossover(results[reference], results[name])
+        faster = f"faster from size {since}" if since is not None else "not faster on the biggest size"
+        print(f"  {name} vs {reference}: {speedup}, {faster}")
+    mismatched = disagreements(results)
+    if not mismatched:
+        print("  answers agree")
+    for size in mismatched:
+        answers = ', '.join(f"{name} {m['answer']}" for name in names for m in results[name] if m['size'] == size)
+        print(f"  answers differ on size {size}: {answers}")
+    return mismatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run families of solver variants head to head on generated inputs")
+    parser.add_argument('--families', nargs='+', choices=list(FAMILIES), default=list(FAMILIES))
+    parser.add_argument('--steps', type=int, default=4, help="number of sizes in the geometric series")
+    parser.add_argument('--factor', type=float, default=2, help="ratio of consecutive sizes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="the fastest run of each size is used")
+    parser.add_argument('--timeout', type=float, default=30, help="drop a variant when a size takes longer [s]")
+    parser.add_argument('--output', help="also write the measurements as json")
+    args = parser.parse_args()
+    report = {}
+    failed = False
+    for family in args.families:
+        results = run_family(family, args.steps, args.factor, args.seed, args.repeat, args.timeout)
+        failed |= bool(print_family(family, results))
+        report[family] = results
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, default=str)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()